@@ -0,0 +1,253 @@
+import threading
+from typing import Callable, Iterable
+import pandas as pd
+import nfl_data_py as nfl
+
+import data_source
+from schema import WEEKLY_COLUMNS, compact_weekly_data
+
+def select_seasons(df: pd.DataFrame, years: Iterable[int]) -> pd.DataFrame:
+    """
+    Returns the rows of a season-split DataFrame that belong to the given seasons.
+    The DataFrame itself is returned when it holds no other seasons.
+
+    Args:
+        df (pd.DataFrame): Data with a season column.
+        years (Iterable[int]): The seasons to keep.
+
+    Returns:
+        pd.DataFrame: The selected rows.
+    """
+    if df.empty:
+        return df
+    mask = df['season'].isin(list(years))
+    return df if mask.all() else df[mask]
+
+
+class DataContext:
+    """
+    Loads the nfl_data_py sources shared by the player and team pipelines once per run,
+    along with the products derived from them.
+
+    Each source (weekly data, schedules, rosters, team descriptions) and each derived product
+    (bye weeks, schedule frame, schedule index) is loaded on first access and kept for the lifetime
+    of the context. Loading is thread-safe, so pipelines running concurrently share one copy.
+    The frames are shared between pipelines and must be treated as read-only.
+
+    A context made by subset() selects its seasons from its parent's frames instead of downloading them.
+    """
+
+    def __init__(self, years: Iterable[int], parent: "DataContext" = None):
+        self.years = list(years)
+        self.parent = parent
+        self._lock = threading.Lock()
+        self._locks = {}
+        self._values = {}
+
+    def _get(self, name: str, load: Callable):
+        """
+        Returns a cached value, loading it on first access. Concurrent callers asking for
+        the same value wait for the first load instead of repeating it.
+
+        Args:
+            name (str): The value's name.
+            load (Callable): Produces the value.
+
+        Returns:
+            The cached value.
+        """
+        with self._lock:
+            lock = self._locks.setdefault(name, threading.Lock())
+        with lock:
+            if name not in self._values:
+                self._values[name] = load()
+            return self._values[name]
+
+    def subset(self, years: Iterable[int]) -> "DataContext":
+        """
+        Returns a context for some of this context's seasons, built from this context's frames.
+
+        Args:
+            years (Iterable[int]): The seasons to keep; all of them must be covered by this context.
+
+        Returns:
+            DataContext: The season subset.
+        """
+        return DataContext(years, parent=self)
+
+    def load_seasons(self, name: str, load: Callable[[list], pd.DataFrame]) -> pd.DataFrame:
+        """
+        Loads a season-split source, from the parent context if there is one.
+
+        Args:
+            name (str): The source's name, also its attribute name.
+            load (Callable): Loads a list of seasons when there is no parent.
+
+        Returns:
+            pd.DataFrame: The source's rows for the context's seasons.
+        """
+        if self.parent is not None:
+            return self._get(name, lambda: select_seasons(getattr(self.parent, name), self.years))
+        return self._get(name, lambda: load(self.years))
+
+    @property
+    def weekly_data(self) -> pd.DataFrame:
+        """
+        Weekly player stats for every season in the context: only WEEKLY_COLUMNS, in compact dtypes.
+        Columns the data lacks are loaded as missing values.
+        """
+        def load(years):
+            df = data_source.import_weekly_data(years, columns=WEEKLY_COLUMNS)
+            if list(df.columns) != WEEKLY_COLUMNS:
+                df = df.reindex(columns=WEEKLY_COLUMNS)
+            return compact_weekly_data(df)
+        return self.load_seasons('weekly_data', load)
+
+    @property
+    def schedules(self) -> pd.DataFrame:
+        """Game schedules and scores for every season in the context."""
+        return self.load_seasons('schedules', data_source.import_schedules)
+
+    @property
+    def rosters(self) -> pd.DataFrame:
+        """Season rosters for every season in the context, cleaned with nfl.clean_nfl_data."""
+        return self.load_seasons('rosters', lambda years: nfl.clean_nfl_data(data_source.import_seasonal_rosters(years)))
+
+    @property
+    def team_desc(self) -> pd.DataFrame:
+        """Team descriptions."""
+        if self.parent is not None:
+            return self.parent.team_desc
+        return self._get('team_desc', data_source.import_team_desc)
+
+    @property
+    def bye_weeks(self) -> dict:
+        """(team, season) -> list of bye weeks, from extract_bye_weeks."""
+        # Imported here because the ingestion modules import this one.
+        from player_data.ingestion import extract_bye_weeks
+        return self._get('bye_weeks', lambda: extract_bye_weeks(self.schedules))
+
+    @property
+    def schedule_frame(self) -> pd.DataFrame:
+        """One schedule row per team per game, from build_schedule_frame."""
+        from team_data.ingestion import build_schedule_frame
+        return self._get('schedule_frame', lambda: build_schedule_frame(self.schedules))
+
+    @property
+    def schedule_index(self) -> dict:
+        """(season, week, team_abbr, opponent_team) -> (team_score, opponent_score), from index_schedule_frame."""
+        from team_data.ingestion import index_schedule_frame
+        return self._get('schedule_index', lambda: index_schedule_frame(self.schedule_frame))
+
+
+class SharedSeasonContexts:
+    """
+    Hands the same per-chunk DataContext to several streaming consumers, so a chunk of seasons is
+    downloaded, parsed and held once even though each consumer streams the seasons on its own.
+
+    Each consumer gets a view (see view()) whose subset() returns the shared context for a chunk.
+    A chunk's context is dropped from here once every active consumer has taken it. A consumer
+    that would open a new chunk while max_pending chunks still wait for a slower consumer blocks
+    until that consumer catches up, which bounds the memory held for the slower one. Consumers
+    must ask for the chunks in the same order and close their view when they stop.
+    """
+
+    def __init__(self, years: Iterable[int], consumers: Iterable[str], max_pending: int = 2):
+        self.root = DataContext(years)
+        self.max_pending = max(1, max_pending)
+        self._active = set(consumers)
+        self._condition = threading.Condition()
+        self._pending = {}
+
+    def view(self, consumer: str) -> "SeasonContextView":
+        """
+        Returns the context view used by one consumer.
+
+        Args:
+            consumer (str): The consumer's name, one of those given to the constructor.
+
+        Returns:
+            SeasonContextView: The consumer's view.
+        """
+        return SeasonContextView(self, consumer)
+
+    def _drop_taken(self) -> None:
+        """Drops the chunks every active consumer has taken. Called with the condition held."""
+        for key in [key for key, (_, taken) in self._pending.items() if self._active <= taken]:
+            del self._pending[key]
+        self._condition.notify_all()
+
+    def take(self, consumer: str, years: Iterable[int]) -> DataContext:
+        """
+        Returns the shared context for a chunk of seasons, creating it for the first consumer to ask.
+
+        Args:
+            consumer (str): The asking consumer.
+            years (Iterable[int]): The chunk's seasons.
+
+        Returns:
+            DataContext: The chunk's context.
+        """
+        key = tuple(years)
+        with self._condition:
+            if key not in self._pending:
+                self._condition.wait_for(lambda: len(self._pending) < self.max_pending)
+                self._pending[key] = (DataContext(key), set())
+            context, taken = self._pending[key]
+            taken.add(consumer)
+            self._drop_taken()
+            return context
+
+    def close(self, consumer: str) -> None:
+        """
+        Removes a consumer that has stopped, finished or failed, so no chunk waits for it any longer.
+
+        Args:
+            consumer (str): The stopped consumer.
+        """
+        with self._condition:
+            self._active.discard(consumer)
+            self._drop_taken()
+
+
+class SeasonContextView:
+    """
+    One consumer's view of a SharedSeasonContexts, usable wherever the ingest pipelines take a
+    DataContext: subset() returns the shared chunk context, and the season-independent sources
+    come from the shared root context. Closing the view (or leaving its with block) closes the consumer.
+    """
+
+    def __init__(self, shared: SharedSeasonContexts, consumer: str):
+        self.shared = shared
+        self.consumer = consumer
+
+    def __enter__(self) -> "SeasonContextView":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.shared.close(self.consumer)
+
+    def subset(self, years: Iterable[int]) -> DataContext:
+        """
+        Returns the context shared by all consumers for a chunk of seasons.
+
+        Args:
+            years (Iterable[int]): The chunk's seasons.
+
+        Returns:
+            DataContext: The chunk's context.
+        """
+        return self.shared.take(self.consumer, years)
+
+    @property
+    def rosters(self) -> pd.DataFrame:
+        """Season rosters for every season of the shared contexts."""
+        return self.shared.root.rosters
+
+    @property
+    def team_desc(self) -> pd.DataFrame:
+        """Team descriptions."""
+        return self.shared.root.team_desc
@@ -0,0 +1,333 @@
+import os
+import time
+import threading
+from typing import Callable, Iterable, Optional
+import pandas as pd
+import nfl_data_py as nfl
+
+from ingestion_state import current_nfl_season, season_end
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".nfl_cache")
+
+# Hours a cached current-season file is served before it is downloaded again.
+DEFAULT_CACHE_TTL_HOURS = 6
+
+WEEKLY_DATA = "weekly_data"
+SCHEDULES = "schedules"
+SEASONAL_ROSTERS = "seasonal_rosters"
+TEAM_DESC = "team_desc"
+
+# The first season nfl_data_py has schedules for.
+FIRST_SCHEDULE_SEASON = 1999
+
+DATASET_LOCKS = {}
+DATASET_LOCKS_GUARD = threading.Lock()
+
+def get_cache_dir() -> str:
+    """
+    Returns the directory holding the cached nfl_data_py downloads.
+
+    Reads the AGGREGATOR_CACHE_DIR environment variable, defaulting to Aggregator/.nfl_cache.
+
+    Returns:
+        str: The cache directory.
+    """
+    return os.environ.get("AGGREGATOR_CACHE_DIR", DEFAULT_CACHE_DIR)
+
+def get_cache_ttl() -> float:
+    """
+    Returns how long, in seconds, cached current-season data stays fresh.
+    Past seasons cached after they ended no longer change and are cached forever.
+
+    Reads the AGGREGATOR_CACHE_TTL_HOURS environment variable, defaulting to 6 hours.
+
+    Returns:
+        float: The time-to-live in seconds.
+    """
+    return float(os.environ.get("AGGREGATOR_CACHE_TTL_HOURS", DEFAULT_CACHE_TTL_HOURS)) * 3600
+
+def is_offline() -> bool:
+    """
+    Checks whether downloads are disabled, in which case every dataset is served from the cache.
+
+    Reads the AGGREGATOR_OFFLINE environment variable ("1", "true" or "yes").
+
+    Returns:
+        bool: True in offline mode.
+    """
+    return os.environ.get("AGGREGATOR_OFFLINE", "").strip().lower() in ("1", "true", "yes")
+
+def cache_path(dataset: str, season: Optional[int] = None) -> str:
+    """
+    Returns the Parquet file caching a dataset, or one season of it.
+
+    Args:
+        dataset (str): The dataset name, e.g. WEEKLY_DATA.
+        season (int, optional): The season; None for datasets that are not split by season.
+
+    Returns:
+        str: The cache file path.
+    """
+    name = f"{season}.parquet" if season is not None else f"{dataset}.parquet"
+    return os.path.join(get_cache_dir(), dataset, name)
+
+def is_fresh(path: str, season: Optional[int] = None) -> bool:
+    """
+    Checks whether a cache file can be served without downloading it again.
+    Files of a past season written after it ended (see season_end) never expire; anything else,
+    including a past season cached while it was still being played, expires after get_cache_ttl().
+
+    Args:
+        path (str): The cache file path.
+        season (int, optional): The season the file holds, if any.
+
+    Returns:
+        bool: True if the file exists and has not expired.
+    """
+    if not os.path.exists(path):
+        return False
+    modified = os.path.getmtime(path)
+    if season is not None and season < current_nfl_season() and modified >= season_end(season).timestamp():
+        return True
+    return time.time() - modified < get_cache_ttl()
+
+def write_cache(df: pd.DataFrame, path: str) -> None:
+    """
+    Writes a DataFrame to a cache file. The file is written next to its target and then
+    renamed over it, so an interrupted run never leaves a truncated cache file behind.
+
+    Args:
+        df (pd.DataFrame): The data to cache.
+        path (str): The cache file path.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    df.reset_index(drop=True).to_parquet(temp_path, index=False)
+    os.replace(temp_path, path)
+
+def select_columns(df: pd.DataFrame, columns: Optional[list] = None) -> pd.DataFrame:
+    """
+    Keeps the requested columns a DataFrame has, in the order requested.
+
+    Args:
+        df (pd.DataFrame): The data.
+        columns (list, optional): The columns to keep. Defaults to every column.
+
+    Returns:
+        pd.DataFrame: The selected columns.
+    """
+    if columns is None:
+        return df
+    return df[[column for column in columns if column in df.columns]]
+
+def read_cache(path: str, columns: Optional[list] = None) -> pd.DataFrame:
+    """
+    Reads a cache file, optionally only some of its columns. Parquet reads only the requested
+    columns from disk; requested columns the file does not have are left out.
+
+    Args:
+        path (str): The cache file path.
+        columns (list, optional): The columns to read. Defaults to every column.
+
+    Returns:
+        pd.DataFrame: The cached data.
+    """
+    try:
+        return pd.read_parquet(path, columns=columns)
+    except (ValueError, KeyError):
+        if columns is None:
+            raise
+        # The file lacks one of the columns, so read it whole to find the ones it has.
+        return select_columns(pd.read_parquet(path), columns)
+
+def is_not_found(error: Exception) -> bool:
+    """
+    Checks whether a download failed because the file does not exist (HTTP 404), as happens for
+    a season nflverse has not published yet.
+
+    Args:
+        error (Exception): The download error.
+
+    Returns:
+        bool: True for a missing file.
+    """
+    return isinstance(error, FileNotFoundError) or getattr(error, 'code', None) == 404
+
+def dataset_lock(dataset: str) -> threading.Lock:
+    """
+    Returns the lock serializing cache reads and downloads of a dataset within the process,
+    so concurrent pipelines asking for the same season download it only once.
+
+    Args:
+        dataset (str): The dataset name, e.g. WEEKLY_DATA.
+
+    Returns:
+        threading.Lock: The dataset's lock.
+    """
+    with DATASET_LOCKS_GUARD:
+        return DATASET_LOCKS.setdefault(dataset, threading.Lock())
+
+def load_seasons(dataset: str, years: Iterable[int], fetch: Callable[[list], pd.DataFrame],
+                 columns: Optional[list] = None, covers: Optional[Iterable[int]] = None) -> pd.DataFrame:
+    """
+    Loads a season-split dataset, downloading only the seasons that are missing from the cache
+    or have expired, and caching each downloaded season in its own Parquet file.
+
+    In offline mode every season is served from the cache, expired or not. When a download
+    fails, expired cache files are served instead if every requested season has one. The current
+    season is loaded as empty when its file is not published yet (e.g. in the preseason).
+
+    Downloads are cached with every column, and only the requested columns are read back, so
+    the projection prunes what is read from the cache rather than what is downloaded. Requested
+    columns the dataset does not have are left out.
+
+    A dataset whose download covers several seasons whatever is asked for (covers) is downloaded
+    for all of them at once, and every one of them is cached, so later calls are served from the cache.
+
+    Args:
+        dataset (str): The dataset name, e.g. WEEKLY_DATA.
+        years (Iterable[int]): The seasons to load.
+        fetch (Callable): Downloads a list of seasons and returns them as one DataFrame with a season column.
+        columns (list, optional): The columns to load. Defaults to every column.
+        covers (Iterable[int], optional): The seasons a single download holds. Defaults to
+            downloading only the missing seasons.
+
+    Returns:
+        pd.DataFrame: The requested seasons, in the order given.
+
+    Raises:
+        FileNotFoundError: In offline mode, if a season has never been cached.
+    """
+    # Pipelines running on other threads wait here, then read what the first one cached.
+    with dataset_lock(dataset):
+        years = list(years)
+        offline = is_offline()
+        frames = {}
+        stale = []
+        for season in years:
+            path = cache_path(dataset, season)
+            if is_fresh(path, season) or (offline and os.path.exists(path)):
+                frames[season] = read_cache(path, columns)
+            elif offline:
+                raise FileNotFoundError(f"{dataset} for season {season} is not cached and AGGREGATOR_OFFLINE is set.")
+            else:
+                stale.append(season)
+
+        if stale:
+            fetched = sorted(set(covers) | set(stale)) if covers is not None else stale
+            unpublished = None
+            while fetched:
+                print(f"[DEBUG] Downloading {dataset} for seasons {fetched}.")
+                try:
+                    fetched_df = fetch(fetched)
+                    break
+                except Exception as e:
+                    expired = {season: read_cache(cache_path(dataset, season), columns)
+                               for season in stale if os.path.exists(cache_path(dataset, season))}
+                    current_season = current_nfl_season()
+                    if len(expired) == len(stale):
+                        print(f"[ERROR] Failed to download {dataset}, serving expired cache: {e}")
+                        frames.update(expired)
+                        stale = fetched = []
+                    elif is_not_found(e) and current_season in fetched and covers is None:
+                        print(f"[INFO] {dataset} for season {current_season} is not published yet, loading it as empty.")
+                        # Download the other seasons again, with the same fallback to the expired cache.
+                        stale.remove(current_season)
+                        fetched = stale
+                        unpublished = current_season
+                    else:
+                        raise
+
+            missing = [column for column in columns or [] if column not in fetched_df.columns] if fetched else []
+            if missing:
+                print(f"[INFO] {dataset} has no columns {missing}, leaving them out.")
+            for season in fetched:
+                path = cache_path(dataset, season)
+                season_df = fetched_df[fetched_df['season'] == season]
+                # Seasons without data yet are not cached, so the next run asks for them again.
+                # A download covering them says they have none yet, until the file expires.
+                if covers is not None or not season_df.empty:
+                    write_cache(season_df, path)
+                if season in stale:
+                    frames[season] = select_columns(season_df, columns)
+
+            if unpublished is not None:
+                # The empty season takes its columns from the seasons loaded, if there are any.
+                loaded = next(iter(frames.values()), None)
+                frames[unpublished] = (loaded.iloc[:0] if loaded is not None
+                                       else pd.DataFrame(columns=columns or ['season']))
+
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat([frames[season] for season in years if season in frames], ignore_index=True)
+
+def import_weekly_data(years: Iterable[int], columns: Optional[list] = None) -> pd.DataFrame:
+    """
+    Cached nfl_data_py.import_weekly_data. nfl_data_py reads each season's whole file whatever
+    columns are asked for, so seasons are downloaded and cached with every column, and only
+    the requested columns are read back from the cache.
+
+    Args:
+        years (Iterable[int]): The seasons to load.
+        columns (list, optional): Only load these columns; those the data lacks are left out.
+            Defaults to every column.
+
+    Returns:
+        pd.DataFrame: Weekly player stats.
+    """
+    return load_seasons(WEEKLY_DATA, years, nfl.import_weekly_data, columns)
+
+def import_schedules(years: Iterable[int]) -> pd.DataFrame:
+    """
+    Cached nfl_data_py.import_schedules. nfl_data_py downloads every season's schedule in one
+    file whatever seasons are asked for, so all of them are cached from a single download.
+
+    Args:
+        years (Iterable[int]): The seasons to load.
+
+    Returns:
+        pd.DataFrame: Game schedules and scores.
+    """
+    return load_seasons(SCHEDULES, years, nfl.import_schedules,
+                        covers=range(FIRST_SCHEDULE_SEASON, current_nfl_season() + 1))
+
+def import_seasonal_rosters(years: Iterable[int]) -> pd.DataFrame:
+    """
+    Cached nfl_data_py.import_seasonal_rosters.
+
+    Args:
+        years (Iterable[int]): The seasons to load.
+
+    Returns:
+        pd.DataFrame: Season rosters.
+    """
+    return load_seasons(SEASONAL_ROSTERS, years, nfl.import_seasonal_rosters)
+
+def import_team_desc() -> pd.DataFrame:
+    """
+    Cached nfl_data_py.import_team_desc. Team descriptions are not split by season and
+    expire after get_cache_ttl().
+
+    Returns:
+        pd.DataFrame: Team descriptions.
+
+    Raises:
+        FileNotFoundError: In offline mode, if team descriptions have never been cached.
+    """
+    with dataset_lock(TEAM_DESC):
+        path = cache_path(TEAM_DESC)
+        if is_fresh(path) or (is_offline() and os.path.exists(path)):
+            return pd.read_parquet(path)
+        if is_offline():
+            raise FileNotFoundError(f"{TEAM_DESC} is not cached and AGGREGATOR_OFFLINE is set.")
+
+        print(f"[DEBUG] Downloading {TEAM_DESC}.")
+        try:
+            teams_df = nfl.import_team_desc()
+        except Exception as e:
+            if not os.path.exists(path):
+                raise
+            print(f"[ERROR] Failed to download {TEAM_DESC}, serving expired cache: {e}")
+            return pd.read_parquet(path)
+        write_cache(teams_df, path)
+        return teams_df
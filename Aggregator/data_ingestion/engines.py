@@ -0,0 +1,166 @@
+import os
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.orm import sessionmaker, Session
+
+DEFAULT_POOL_SIZE = 5
+DEFAULT_MAX_OVERFLOW = 10
+
+# Seconds a single statement may run on PostgreSQL before it is cancelled; 0 disables the limit.
+DEFAULT_STATEMENT_TIMEOUT_SECONDS = 600
+
+# Rows per INSERT statement when SQLAlchemy batches an executemany (insertmanyvalues and psycopg2 batches).
+DEFAULT_INSERT_PAGE_SIZE = 5000
+
+ENGINES = {}
+SESSION_FACTORIES = {}
+ENGINES_LOCK = threading.Lock()
+
+def get_pool_size() -> int:
+    """
+    Returns the number of connections each engine keeps open.
+
+    Reads the AGGREGATOR_DB_POOL_SIZE environment variable, defaulting to 5.
+
+    Returns:
+        int: The pool size.
+    """
+    return max(1, int(os.environ.get("AGGREGATOR_DB_POOL_SIZE", DEFAULT_POOL_SIZE)))
+
+def get_max_overflow() -> int:
+    """
+    Returns how many connections an engine may open beyond its pool size under load.
+
+    Reads the AGGREGATOR_DB_MAX_OVERFLOW environment variable, defaulting to 10.
+
+    Returns:
+        int: The maximum overflow.
+    """
+    return max(0, int(os.environ.get("AGGREGATOR_DB_MAX_OVERFLOW", DEFAULT_MAX_OVERFLOW)))
+
+def get_statement_timeout() -> float:
+    """
+    Returns the PostgreSQL statement timeout in seconds.
+
+    Reads the AGGREGATOR_DB_STATEMENT_TIMEOUT_SECONDS environment variable, defaulting to 600.
+    0 disables the timeout.
+
+    Returns:
+        float: The timeout in seconds.
+    """
+    return max(0.0, float(os.environ.get("AGGREGATOR_DB_STATEMENT_TIMEOUT_SECONDS", DEFAULT_STATEMENT_TIMEOUT_SECONDS)))
+
+def get_insert_page_size() -> int:
+    """
+    Returns the number of rows sent per INSERT statement when rows are inserted in batches.
+
+    Reads the AGGREGATOR_DB_INSERT_PAGE_SIZE environment variable, defaulting to 5,000.
+
+    Returns:
+        int: Rows per statement.
+    """
+    return max(1, int(os.environ.get("AGGREGATOR_DB_INSERT_PAGE_SIZE", DEFAULT_INSERT_PAGE_SIZE)))
+
+def engine_options(db_url: str) -> dict:
+    """
+    Returns the create_engine options for a database URL.
+
+    Every engine checks connections before use (pool_pre_ping) and batches multi-row inserts
+    by get_insert_page_size(). PostgreSQL engines also get a sized connection pool and the
+    statement timeout; psycopg2 additionally sends executemany batches as multi-row VALUES.
+
+    Args:
+        db_url (str): The database URL.
+
+    Returns:
+        dict: Keyword arguments for create_engine.
+    """
+    url = make_url(db_url)
+    page_size = get_insert_page_size()
+    options = {"pool_pre_ping": True, "insertmanyvalues_page_size": page_size}
+    if url.get_backend_name() != "postgresql":
+        return options
+
+    options.update(pool_size=get_pool_size(), max_overflow=get_max_overflow())
+    timeout_ms = int(get_statement_timeout() * 1000)
+    if timeout_ms:
+        options["connect_args"] = {"options": f"-c statement_timeout={timeout_ms}"}
+    if url.get_driver_name() == "psycopg2":
+        options.update(executemany_mode="values_plus_batch", executemany_batch_page_size=page_size)
+    return options
+
+def get_engine(db_url: str, setup: Optional[Callable[[Engine], None]] = None) -> Engine:
+    """
+    Returns the shared engine of a database, creating it on first use.
+    Every caller in the process shares the engine and its connection pool.
+
+    Args:
+        db_url (str): The database URL.
+        setup (Callable, optional): Run once with the new engine, e.g. to create the tables.
+
+    Returns:
+        Engine: The engine.
+    """
+    with ENGINES_LOCK:
+        engine = ENGINES.get(db_url)
+        if engine is None:
+            engine = create_engine(db_url, **engine_options(db_url))
+            if setup is not None:
+                try:
+                    setup(engine)
+                except Exception:
+                    engine.dispose()
+                    raise
+            ENGINES[db_url] = engine
+        return engine
+
+def get_session_factory(engine: Engine) -> sessionmaker:
+    """
+    Returns the session factory bound to an engine, created once per engine.
+
+    Args:
+        engine (Engine): The engine.
+
+    Returns:
+        sessionmaker: The session factory.
+    """
+    with ENGINES_LOCK:
+        factory = SESSION_FACTORIES.get(engine)
+        if factory is None:
+            factory = SESSION_FACTORIES[engine] = sessionmaker(bind=engine)
+        return factory
+
+@contextmanager
+def session_scope(engine: Engine) -> Iterator[Session]:
+    """
+    Opens a session for the duration of a with block. Work that was not committed is rolled
+    back if the block raises, and the session is always closed, returning its connection
+    to the pool. The scope does not commit; callers commit their own work.
+
+    Args:
+        engine (Engine): The engine.
+
+    Yields:
+        Session: The session.
+    """
+    session = get_session_factory(engine)()
+    try:
+        yield session
+    except BaseException:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+def dispose_engines() -> None:
+    """
+    Closes every pooled connection of every shared engine and forgets the engines.
+    """
+    with ENGINES_LOCK:
+        for engine in ENGINES.values():
+            engine.dispose()
+        ENGINES.clear()
+        SESSION_FACTORIES.clear()
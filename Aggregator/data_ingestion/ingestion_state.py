@@ -0,0 +1,159 @@
+from datetime import datetime
+from typing import Optional, NamedTuple
+import pandas as pd
+from sqlalchemy import Column, String, Integer, DateTime
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import Session
+
+BaseState = declarative_base()
+
+PLAYER_GAME_LOGS = "player_game_logs"
+TEAM_GAME_LOGS = "team_game_logs"
+ROSTERS = "rosters"
+
+# First season fetched by updates when a dataset has no watermark yet.
+DEFAULT_UPDATE_START_SEASON = 2023
+
+class IngestionState(BaseState):
+    """
+    ORM model for the ingestion_state table.
+
+    Stores the last (season, season_type, week) loaded for each dataset, so updates
+    only fetch the seasons that can still change and only write rows from it onwards.
+    The table exists in both the player_data and team_data databases.
+    """
+    __tablename__ = 'ingestion_state'
+
+    dataset = Column(String(50), primary_key=True)
+    season = Column(Integer, nullable=False)
+    season_type = Column(String(10), nullable=False)
+    week = Column(Integer, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<IngestionState(dataset={self.dataset}, season={self.season}, week={self.week})>"
+
+
+class Watermark(NamedTuple):
+    season: int
+    season_type: str
+    week: int
+
+
+def current_nfl_season(today: Optional[datetime] = None) -> int:
+    """
+    Returns the NFL season in progress (or most recently finished) on the given date.
+    A season starts in September and ends in February of the following year.
+
+    Args:
+        today (datetime, optional): The reference date. Defaults to now.
+
+    Returns:
+        int: The season year.
+    """
+    today = today or datetime.now()
+    return today.year if today.month >= 9 else today.year - 1
+
+def season_end(season: int) -> datetime:
+    """
+    Returns the date by which every game of a season, including the Super Bowl, has been played.
+
+    Args:
+        season (int): The season year.
+
+    Returns:
+        datetime: March 1 of the following year.
+    """
+    return datetime(season + 1, 3, 1)
+
+def get_watermark(session: Session, dataset: str) -> Optional[Watermark]:
+    """
+    Returns the last loaded (season, season_type, week) for a dataset.
+
+    Args:
+        session: SQLAlchemy session.
+        dataset: The dataset name, e.g. PLAYER_GAME_LOGS.
+
+    Returns:
+        Watermark or None if the dataset has never been recorded.
+    """
+    state = session.get(IngestionState, dataset)
+    if state is None:
+        return None
+    return Watermark(state.season, state.season_type, state.week)
+
+def set_watermark(session: Session, dataset: str, watermark: Optional[Watermark]) -> None:
+    """
+    Records the last loaded (season, season_type, week) for a dataset and commits.
+    The watermark never moves backwards.
+
+    Args:
+        session: SQLAlchemy session.
+        dataset: The dataset name, e.g. PLAYER_GAME_LOGS.
+        watermark: The new watermark; None leaves the state unchanged.
+    """
+    if watermark is None:
+        return
+    state = session.get(IngestionState, dataset)
+    if state is None:
+        state = IngestionState(dataset=dataset)
+        session.add(state)
+    elif (state.season, state.week) >= (watermark.season, watermark.week):
+        return
+    state.season = watermark.season
+    state.season_type = watermark.season_type
+    state.week = watermark.week
+    state.updated_at = datetime.now()
+    session.commit()
+
+def watermark_from_frame(df: pd.DataFrame) -> Optional[Watermark]:
+    """
+    Returns the latest (season, season_type, week) present in a DataFrame.
+    Weeks are numbered continuously through the postseason, so (season, week) orders rows.
+
+    Args:
+        df (pd.DataFrame): Data with a season column and, optionally, week and
+            season_type (or game_type) columns. Missing weeks count as week 0.
+
+    Returns:
+        Watermark or None if df is empty.
+    """
+    if df.empty:
+        return None
+    sort_columns = ['season', 'week'] if 'week' in df.columns else ['season']
+    latest = df.sort_values(sort_columns, kind='mergesort').iloc[-1]
+    type_column = 'season_type' if 'season_type' in df.columns else 'game_type'
+    season_type = latest[type_column] if type_column in df.columns else 'REG'
+    week = int(latest['week']) if 'week' in df.columns else 0
+    return Watermark(int(latest['season']), str(season_type), week)
+
+def seasons_to_update(watermark: Optional[Watermark], default_start: int) -> list:
+    """
+    Lists the seasons that can still change: from the watermark's season through the current season.
+
+    Args:
+        watermark: The dataset's watermark, or None.
+        default_start (int): First season to fetch when there is no watermark.
+
+    Returns:
+        list: Seasons to fetch.
+    """
+    start = watermark.season if watermark is not None else default_start
+    return list(range(start, current_nfl_season() + 1))
+
+def filter_since_watermark(df: pd.DataFrame, watermark: Optional[Watermark]) -> pd.DataFrame:
+    """
+    Keeps only the rows in or after the watermark's week. The watermark week itself is kept
+    because a week can be loaded while some of its games have not been played yet.
+
+    Args:
+        df (pd.DataFrame): Data with season and week columns.
+        watermark: The dataset's watermark, or None to keep every row.
+
+    Returns:
+        pd.DataFrame: The rows since the watermark.
+    """
+    if watermark is None:
+        return df
+    since = (df['season'] > watermark.season) | ((df['season'] == watermark.season) & (df['week'] >= watermark.week))
+    return df[since]
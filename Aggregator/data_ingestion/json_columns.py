@@ -0,0 +1,71 @@
+from typing import Dict, Iterable, List
+from sqlalchemy import JSON, Table, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.engine import Engine
+
+# Column type of every stat and info payload: JSONB on PostgreSQL, so ->> reads a stored binary value
+# instead of re-parsing text and the payloads can be indexed, and plain JSON on other databases.
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+def find_json_columns(engine: Engine) -> Dict[str, List[str]]:
+    """
+    Lists the columns still stored as plain json in the current schema, in a single catalog query.
+    Partitions are skipped, since their columns change with their parent table.
+
+    Args:
+        engine (Engine): A PostgreSQL engine.
+
+    Returns:
+        dict: Table name -> its json columns, in column order.
+    """
+    query = text(
+        "SELECT c.relname, a.attname FROM pg_attribute a "
+        "JOIN pg_class c ON c.oid = a.attrelid "
+        "JOIN pg_namespace n ON n.oid = c.relnamespace "
+        "WHERE n.nspname = current_schema() AND c.relkind IN ('r', 'p') AND NOT c.relispartition "
+        "AND a.atttypid = 'json'::regtype AND a.attnum > 0 AND NOT a.attisdropped "
+        "ORDER BY c.relname, a.attnum"
+    )
+    columns = {}
+    with engine.connect() as conn:
+        for table, column in conn.execute(query):
+            columns.setdefault(table, []).append(column)
+    return columns
+
+def migrate_json_columns(engine: Engine) -> int:
+    """
+    Converts every json column of the database to jsonb. Each table is converted in its own
+    transaction, and converted tables are not found again, so the migration can be re-run after
+    an interruption. Does nothing on non-PostgreSQL engines.
+
+    Args:
+        engine (Engine): SQLAlchemy engine for the player_data or team_data database.
+
+    Returns:
+        int: The number of tables converted.
+    """
+    if engine.dialect.name != "postgresql":
+        return 0
+    tables = find_json_columns(engine)
+    if tables:
+        print(f"[DEBUG] Converting json columns of {len(tables)} tables to jsonb.")
+    for count, (table, columns) in enumerate(tables.items(), start=1):
+        alterations = ", ".join(f'ALTER COLUMN "{column}" TYPE JSONB USING "{column}"::jsonb' for column in columns)
+        with engine.begin() as conn:
+            conn.execute(text(f'ALTER TABLE "{table}" {alterations}'))
+        if count % 500 == 0:
+            print(f"[DEBUG] Converted {count}/{len(tables)} tables to jsonb.")
+    return len(tables)
+
+def create_indexes(engine: Engine, tables: Iterable[Table]) -> None:
+    """
+    Creates the indexes declared on tables that already existed when their indexes were added,
+    which create_all does not do. Indexes limited to PostgreSQL are skipped elsewhere.
+
+    Args:
+        engine (Engine): The database engine.
+        tables (Iterable[Table]): The tables whose indexes are created.
+    """
+    for table in tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
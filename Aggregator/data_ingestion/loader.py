@@ -0,0 +1,201 @@
+import io
+import os
+import json
+from typing import Any, Dict, List, Optional
+from sqlalchemy import JSON
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+DEFAULT_BATCH_SIZE = 50000
+
+def get_copy_batch_size() -> int:
+    """
+    Returns the number of rows loaded per transaction.
+
+    Reads the AGGREGATOR_COPY_BATCH_SIZE environment variable, defaulting to 50,000 rows.
+
+    Returns:
+        int: Rows per transaction.
+    """
+    return max(1, int(os.environ.get("AGGREGATOR_COPY_BATCH_SIZE", DEFAULT_BATCH_SIZE)))
+
+def supports_copy(session: Session) -> bool:
+    """
+    Checks whether the session is bound to a PostgreSQL database through psycopg2,
+    which is required for COPY ... FROM STDIN via copy_expert.
+
+    Args:
+        session: SQLAlchemy session.
+
+    Returns:
+        bool: True if COPY can be used, False otherwise.
+    """
+    dialect = session.get_bind().dialect
+    return dialect.name == "postgresql" and dialect.driver == "psycopg2"
+
+def format_copy_value(value: Any, column) -> str:
+    """
+    Formats a single value for PostgreSQL's COPY text format.
+    JSON columns are serialized the same way SQLAlchemy's JSON type would serialize them,
+    including writing None as JSON null unless the column sets none_as_null.
+
+    Args:
+        value: The Python value.
+        column: The SQLAlchemy Column the value is written to.
+
+    Returns:
+        str: The escaped field.
+    """
+    if isinstance(column.type, JSON):
+        if value is None and column.type.none_as_null:
+            return "\\N"
+        value = json.dumps(value)
+    elif value is None:
+        return "\\N"
+    return (str(value)
+            .replace("\\", "\\\\")
+            .replace("\t", "\\t")
+            .replace("\n", "\\n")
+            .replace("\r", "\\r"))
+
+def copy_records(session: Session, model, records: List[Dict[str, Any]]) -> None:
+    """
+    Streams records into the model's table with COPY ... FROM STDIN.
+    The COPY runs inside the session's current transaction; the caller commits.
+
+    Args:
+        session: SQLAlchemy session bound to a PostgreSQL/psycopg2 engine.
+        model: The ORM model class of the target table.
+        records: Row dictionaries keyed by column name.
+    """
+    columns = list(model.__table__.columns)
+    buffer = io.StringIO()
+    for record in records:
+        buffer.write("\t".join(format_copy_value(record.get(column.name), column) for column in columns))
+        buffer.write("\n")
+    buffer.seek(0)
+
+    column_list = ", ".join(f'"{column.name}"' for column in columns)
+    sql = f'COPY "{model.__table__.name}" ({column_list}) FROM STDIN'
+    dbapi_connection = session.connection().connection
+    with dbapi_connection.cursor() as cursor:
+        cursor.copy_expert(sql, buffer)
+
+
+class BulkLoader:
+    """
+    Buffers rows for one or more tables and writes them in large transactions.
+
+    On PostgreSQL (psycopg2) each buffered table is written with COPY ... FROM STDIN;
+    other engines fall back to session.bulk_insert_mappings. A transaction is
+    committed whenever batch_size rows are pending and when the loader is flushed
+    or closed. Use as a context manager so the final partial batch is written.
+    """
+
+    def __init__(self, session: Session, batch_size: Optional[int] = None):
+        self.session = session
+        self.batch_size = batch_size or get_copy_batch_size()
+        self.use_copy = supports_copy(session)
+        self.pending = {}
+        self.pending_rows = 0
+        self.loaded_rows = 0
+
+    def add(self, model, records: List[Dict[str, Any]]) -> None:
+        """
+        Queues records for the model's table, flushing once batch_size rows are pending.
+
+        Args:
+            model: The ORM model class of the target table.
+            records: Row dictionaries keyed by column name.
+        """
+        if not records:
+            return
+        self.pending.setdefault(model, []).extend(records)
+        self.pending_rows += len(records)
+        if self.pending_rows >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Writes every pending row and commits them in one transaction.
+        """
+        if not self.pending:
+            return
+        try:
+            for model, records in self.pending.items():
+                if self.use_copy:
+                    copy_records(self.session, model, records)
+                else:
+                    self.session.bulk_insert_mappings(model, records)
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        self.loaded_rows += self.pending_rows
+        self.pending = {}
+        self.pending_rows = 0
+
+    def __enter__(self) -> "BulkLoader":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.flush()
+
+
+def bulk_load(session: Session, model, records: List[Dict[str, Any]], batch_size: Optional[int] = None) -> int:
+    """
+    Loads records into a single table in batches of batch_size rows per transaction.
+
+    Args:
+        session: SQLAlchemy session.
+        model: The ORM model class of the target table.
+        records: Row dictionaries keyed by column name.
+        batch_size (int, optional): Rows per transaction. Defaults to get_copy_batch_size().
+
+    Returns:
+        int: The number of rows loaded.
+    """
+    with BulkLoader(session, batch_size) as loader:
+        loader.add(model, records)
+    return loader.loaded_rows
+
+
+def insert_missing_records(session: Session, model, records: List[Dict[str, Any]],
+                           batch_size: Optional[int] = None) -> int:
+    """
+    Inserts records with set-based INSERT ... ON CONFLICT DO NOTHING statements, so rows whose
+    primary key already exists are skipped by the database instead of being loaded and compared
+    in Python. Statements are executed in batches of batch_size rows inside the session's
+    current transaction; the caller commits.
+
+    Args:
+        session: SQLAlchemy session bound to a PostgreSQL or SQLite engine.
+        model: The ORM model class of the target table.
+        records: Row dictionaries keyed by column name.
+        batch_size (int, optional): Rows per statement batch. Defaults to get_copy_batch_size().
+
+    Returns:
+        int: The number of rows actually inserted.
+
+    Raises:
+        ValueError: If the engine's dialect has no ON CONFLICT support.
+    """
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        insert = pg_insert
+    elif dialect == "sqlite":
+        insert = sqlite_insert
+    else:
+        raise ValueError(f"ON CONFLICT inserts are not supported for the {dialect} dialect.")
+
+    if not records:
+        return 0
+    table = model.__table__
+    stmt = insert(table).on_conflict_do_nothing().returning(*table.primary_key.columns)
+    batch_size = batch_size or get_copy_batch_size()
+    inserted = 0
+    for start in range(0, len(records), batch_size):
+        inserted += len(session.execute(stmt, records[start:start + batch_size]).all())
+    return inserted
@@ -1,46 +1,80 @@
-from player_data.database import initialize_player_database, is_player_database_populated, get_player_session
+import sys
+from player_data.database import initialize_player_database, is_player_database_populated, player_session_scope
 from player_data.ingestion import ingest_player_data
-from team_data.database import initialize_team_database, is_team_database_populated, get_team_session
+from team_data.database import initialize_team_database, is_team_database_populated, team_session_scope
 from team_data.ingestion import ingest_team_data
-from player_data.updater import update_player_game_logs
+from player_data.updater import update_player_basic_info, update_player_game_logs
 from team_data.updater import update_team_game_logs
-from datetime import datetime
+from ingestion_state import (current_nfl_season, get_watermark, seasons_to_update, PLAYER_GAME_LOGS,
+                             TEAM_GAME_LOGS, ROSTERS, DEFAULT_UPDATE_START_SEASON)
+from contextlib import nullcontext
+from data_context import DataContext, SharedSeasonContexts
+from stages import Stage, get_pipeline_workers, run_stages, report_stage_results
+from engines import dispose_engines
 
-def main() -> None:
+def main() -> bool:
     """
     Main function to initialize databases and ingest NFL data.
+    The player and team stages write to separate databases and run concurrently; a failure in
+    one stage is reported without stopping the other.
+
+    Returns:
+        bool: True if every stage succeeded.
     """
     try:
         player_engine = initialize_player_database()
-        player_session = get_player_session(player_engine)
-
         print("[DEBUG] Initialized player_data database.")
-        
-        team_engine = initialize_team_database()
-        team_session = get_team_session(team_engine)
 
+        team_engine = initialize_team_database()
         print("[DEBUG] Initialized team_data database.")
-        
-        current_year = datetime.now().year
 
-        if is_player_database_populated(player_session) or is_team_database_populated(team_session):
+        current_season = current_nfl_season()
+
+        with player_session_scope(player_engine) as player_session, team_session_scope(team_engine) as team_session:
+            populated = is_player_database_populated(player_session) or is_team_database_populated(team_session)
+            # Each updater only reads the seasons since its ingestion_state watermark, so the shared
+            # context loads every season any of them needs, once.
+            watermarks = [get_watermark(player_session, ROSTERS), get_watermark(player_session, PLAYER_GAME_LOGS),
+                          get_watermark(team_session, TEAM_GAME_LOGS)] if populated else []
+
+        if populated:
             print("[INFO] Databases detected as already populated. Starting data update...")
-            update_years = list(range(2023, current_year))
-            
-            update_player_game_logs(player_engine, update_years)
-            update_team_game_logs(team_engine, update_years)
-            
-            print("[DEBUG] Data update complete.")
-            return 
-        
-        print("[INFO] No existing data found. Starting full data ingestion...")
-        years = list(range(2000, current_year))
-        ingest_player_data(years=years, engine=player_engine)
-        ingest_team_data(years=years, engine=team_engine)
-        
-        print("[DEBUG] Data ingestion complete.")
+            years = sorted(set().union(*(seasons_to_update(w, DEFAULT_UPDATE_START_SEASON) for w in watermarks)))
+            context = DataContext(years)
+            stages = [
+                # Game logs are only written for players known to player_basic_info, so rosters go first.
+                Stage("player update", [lambda: update_player_basic_info(player_engine, context=context),
+                                        lambda: update_player_game_logs(player_engine, context=context)]),
+                Stage("team update", [lambda: update_team_game_logs(team_engine, context=context)]),
+            ]
+        else:
+            print("[INFO] No existing data found. Starting full data ingestion...")
+            years = list(range(2000, current_season + 1))
+            # Both stages stream one chunk of seasons at a time and share each chunk's context, so
+            # it is downloaded and parsed once. Run one after another, they cannot share a chunk
+            # without holding every season, so each stage then loads its own.
+            shared = SharedSeasonContexts(years, ["player", "team"]) if get_pipeline_workers() > 1 else None
+
+            def stream(ingest, engine, consumer: str) -> None:
+                with shared.view(consumer) if shared is not None else nullcontext() as context:
+                    ingest(years=years, engine=engine, context=context)
+
+            stages = [
+                Stage("player ingestion", [lambda: stream(ingest_player_data, player_engine, "player")]),
+                Stage("team ingestion", [lambda: stream(ingest_team_data, team_engine, "team")]),
+            ]
     except Exception as e:
-        print(f"[ERROR] An error occurred during ingestion: {str(e)}")
+        print(f"[ERROR] An error occurred while preparing ingestion: {str(e)}")
+        dispose_engines()
+        return False
+
+    try:
+        succeeded = report_stage_results(run_stages(stages))
+    finally:
+        # Close the pooled connections of both databases.
+        dispose_engines()
+    print("[DEBUG] Data ingestion complete." if succeeded else "[ERROR] Data ingestion finished with failures.")
+    return succeeded
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,94 @@
+import threading
+from typing import Callable, Iterable, List
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+
+class ModelRegistry:
+    """
+    Caches the dynamically declared per-entity ORM models (e.g. one {player_id}_game_logs table per
+    player) and the tables that exist in each database.
+
+    A model class can only be declared once per declarative base, so each entity's model is built
+    the first time it is asked for and reused afterwards. The existing tables of a database are
+    reflected once, and the tables that are missing are created together in one transaction, so
+    setting up tables costs a constant number of round trips instead of one per entity.
+    """
+
+    def __init__(self, create_model: Callable[[str], type]):
+        """
+        Args:
+            create_model (Callable): Declares the model of one entity, e.g. create_player_game_log_model.
+        """
+        self.create_model = create_model
+        self.models = {}
+        self.tables = {}
+        # Stages and pipeline threads may resolve models at the same time.
+        self.lock = threading.RLock()
+
+    def model(self, key: str) -> type:
+        """
+        Returns an entity's model class, declaring it on first use. Does not touch the database.
+
+        Args:
+            key (str): The entity, e.g. a player ID or team abbreviation.
+
+        Returns:
+            The ORM model class.
+        """
+        with self.lock:
+            Model = self.models.get(key)
+            if Model is None:
+                Model = self.models[key] = self.create_model(key)
+            return Model
+
+    def existing_tables(self, engine: Engine) -> set:
+        """
+        Returns the names of the tables in an engine's database, reflected on first use
+        and kept up to date with the tables this registry creates.
+
+        Args:
+            engine (Engine): The database engine.
+
+        Returns:
+            set: The table names.
+        """
+        with self.lock:
+            url = str(engine.url)
+            if url not in self.tables:
+                self.tables[url] = set(inspect(engine).get_table_names())
+            return self.tables[url]
+
+    def ensure_tables(self, engine: Engine, keys: Iterable[str]) -> List[type]:
+        """
+        Returns the models of several entities, creating every missing table in a single transaction.
+
+        Args:
+            engine (Engine): The database engine.
+            keys (Iterable[str]): The entities.
+
+        Returns:
+            List[type]: The model classes, one per distinct key, in the order given.
+        """
+        with self.lock:
+            existing = self.existing_tables(engine)
+            models = [self.model(key) for key in dict.fromkeys(keys)]
+            missing = [Model.__table__ for Model in models if Model.__table__.name not in existing]
+            if missing:
+                with engine.begin() as conn:
+                    missing[0].metadata.create_all(conn, tables=missing, checkfirst=False)
+                existing.update(table.name for table in missing)
+                print(f"[DEBUG] Created {len(missing)} tables.")
+            return models
+
+    def get(self, key: str, engine: Engine) -> type:
+        """
+        Returns an entity's model, creating its table if it does not exist yet.
+
+        Args:
+            key (str): The entity.
+            engine (Engine): The database engine.
+
+        Returns:
+            The ORM model class.
+        """
+        return self.ensure_tables(engine, [key])[0]
@@ -0,0 +1,230 @@
+import gc
+import os
+import sys
+import queue
+import resource
+import multiprocessing
+import threading
+from typing import Any, Callable, Iterable, List
+
+DEFAULT_QUEUE_SIZE = 1
+DEFAULT_CHUNK_SEASONS = 1
+
+# Peak resident memory of the ingestion process and its worker processes, in MB, that a full
+# 2000-present ingest should stay under with the default chunk, queue and worker counts.
+# See the Aggregator section of the README.
+DEFAULT_PEAK_RSS_TARGET_MB = 768
+
+# Marks the end of a stage's output.
+DONE = object()
+
+def get_pipeline_queue_size() -> int:
+    """
+    Returns how many finished items each pipeline stage may hold for the next stage
+    before it blocks.
+
+    Reads the AGGREGATOR_PIPELINE_QUEUE_SIZE environment variable, defaulting to 1, so at most
+    one item waits between two stages while each stage works on another.
+
+    Returns:
+        int: The queue size.
+    """
+    return max(1, int(os.environ.get("AGGREGATOR_PIPELINE_QUEUE_SIZE", DEFAULT_QUEUE_SIZE)))
+
+def get_chunk_seasons() -> int:
+    """
+    Returns how many seasons are ingested together as one pipeline item.
+
+    Reads the AGGREGATOR_INGEST_CHUNK_SEASONS environment variable, defaulting to 1. Larger chunks
+    make fewer, larger database batches at the cost of proportionally more memory.
+
+    Returns:
+        int: Seasons per chunk.
+    """
+    return max(1, int(os.environ.get("AGGREGATOR_INGEST_CHUNK_SEASONS", DEFAULT_CHUNK_SEASONS)))
+
+def get_peak_rss_target_mb() -> float:
+    """
+    Returns the peak resident memory target, in MB, checked after every pipeline item.
+
+    Reads the AGGREGATOR_PEAK_RSS_TARGET_MB environment variable, defaulting to 768.
+
+    Returns:
+        float: The target in MB.
+    """
+    return float(os.environ.get("AGGREGATOR_PEAK_RSS_TARGET_MB", DEFAULT_PEAK_RSS_TARGET_MB))
+
+def season_chunks(years: Iterable[int], size: int = None) -> List[list]:
+    """
+    Splits seasons into consecutive chunks, each ingested end to end before its frames are released.
+
+    Args:
+        years (Iterable[int]): The seasons, in order.
+        size (int, optional): Seasons per chunk. Defaults to get_chunk_seasons().
+
+    Returns:
+        List[list]: The chunks.
+    """
+    years = list(years)
+    size = size or get_chunk_seasons()
+    return [years[start:start + size] for start in range(0, len(years), size)]
+
+def peak_rss_mb() -> float:
+    """
+    Returns the peak resident memory of this process so far, in MB.
+
+    Returns:
+        float: Peak RSS in MB.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def worker_peak_rss_mb() -> float:
+    """
+    Returns the summed peak resident memory of this process's running worker processes, in MB,
+    such as the player transform pool.
+
+    RUSAGE_CHILDREN cannot be used: it only covers exited children and reports a spawned child
+    at the parent's size when it was forked. The peak of each worker is read from /proc instead,
+    so it is 0 where /proc is not available.
+
+    Returns:
+        float: Summed peak RSS of the workers in MB.
+    """
+    total = 0.0
+    for child in multiprocessing.active_children():
+        try:
+            with open(f"/proc/{child.pid}/status") as status:
+                total += sum(int(line.split()[1]) for line in status if line.startswith("VmHWM:")) / 1024
+        except OSError:
+            continue
+    return total
+
+def report_memory(item: Any) -> None:
+    """
+    Logs the peak RSS of the process and of its running worker processes after an item has been
+    written, and flags it when their combined peak is over target.
+
+    Args:
+        item: The item just written.
+    """
+    peak = peak_rss_mb()
+    workers = worker_peak_rss_mb()
+    target = get_peak_rss_target_mb()
+    usage = f"Peak RSS {peak:.0f} MB" + (f" plus {workers:.0f} MB in worker processes" if workers else "")
+    if peak + workers > target:
+        print(f"[WARNING] {usage} after {item} exceeds the {target:.0f} MB target; "
+              f"lower AGGREGATOR_INGEST_CHUNK_SEASONS, AGGREGATOR_PIPELINE_QUEUE_SIZE or "
+              f"AGGREGATOR_TRANSFORM_WORKERS.")
+    else:
+        print(f"[DEBUG] {usage} after {item}.")
+
+def put_item(q: queue.Queue, item: Any, stop: threading.Event) -> bool:
+    """
+    Puts an item on a bounded queue, blocking while it is full, unless the pipeline stops.
+
+    Returns:
+        bool: True if the item was queued, False if the pipeline stopped first.
+    """
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+def get_item(q: queue.Queue, stop: threading.Event) -> Any:
+    """
+    Takes the next item from a queue, blocking while it is empty.
+
+    Returns:
+        The item, or DONE once the upstream stage has finished or the pipeline stopped.
+    """
+    while not stop.is_set():
+        try:
+            return q.get(timeout=0.1)
+        except queue.Empty:
+            continue
+    return DONE
+
+def run_pipeline(items: Iterable, fetch: Callable[[Any], Any], transform: Callable[[Any, Any], Any],
+                 write: Callable[[Any, Any], None], queue_size: int = None) -> None:
+    """
+    Runs fetch -> transform -> write over a sequence of items (e.g. seasons) as a pipeline:
+    item N+1 is fetched while item N is transformed and item N-1 is written.
+
+    Fetch and transform each run on their own thread; write runs on the calling thread, so it
+    can use the caller's database session. Stages are connected by bounded queues, so a slow
+    stage makes the faster ones wait instead of piling up items, and memory holds only a few
+    items no matter how many are processed. The first error stops every stage and is re-raised.
+
+    Args:
+        items (Iterable): The items to process, in order.
+        fetch (Callable): fetch(item) -> data.
+        transform (Callable): transform(item, data) -> result.
+        write (Callable): write(item, result); called in item order.
+        queue_size (int, optional): Items held between two stages. Defaults to get_pipeline_queue_size().
+
+    Raises:
+        Exception: The first exception raised by any stage.
+    """
+    queue_size = queue_size or get_pipeline_queue_size()
+    fetched = queue.Queue(maxsize=queue_size)
+    transformed = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    errors = []
+
+    def fetch_stage():
+        try:
+            for item in items:
+                if stop.is_set() or not put_item(fetched, (item, fetch(item)), stop):
+                    return
+            put_item(fetched, DONE, stop)
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+
+    def transform_stage():
+        try:
+            while True:
+                entry = get_item(fetched, stop)
+                if entry is DONE:
+                    break
+                item, data = entry
+                result = transform(item, data)
+                # Release the input before waiting on the writer.
+                del entry, data
+                if not put_item(transformed, (item, result), stop):
+                    return
+                del result
+            put_item(transformed, DONE, stop)
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+
+    threads = [threading.Thread(target=fetch_stage, name="pipeline-fetch", daemon=True),
+               threading.Thread(target=transform_stage, name="pipeline-transform", daemon=True)]
+    for thread in threads:
+        thread.start()
+    try:
+        while True:
+            entry = get_item(transformed, stop)
+            if entry is DONE:
+                break
+            item, result = entry
+            write(item, result)
+            # Release the item's frames and records before the next one arrives.
+            del entry, result
+            gc.collect()
+            report_memory(item)
+    except Exception as e:
+        errors.append(e)
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    if errors:
+        raise errors[0]
@@ -1,8 +1,34 @@
 import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
+from typing import ContextManager, Iterable
+from sqlalchemy import text
+from sqlalchemy.orm import Session
 from sqlalchemy.engine import Engine
-from .models import PlayerBasicInfo, BasePlayer
+from ingestion_state import BaseState
+from engines import get_engine, get_session_factory, session_scope
+from json_columns import migrate_json_columns, create_indexes
+from .models import PlayerBasicInfo, PlayerGameLog, BasePlayer
+
+PER_PLAYER_STORAGE = "per_player"
+PARTITIONED_STORAGE = "partitioned"
+
+def get_player_game_log_storage() -> str:
+    """
+    Returns the configured storage mode for player game logs.
+
+    Reads the PLAYER_GAME_LOG_STORAGE environment variable:
+      - "per_player" (default): one {player_id}_game_logs table per player.
+      - "partitioned": every log in the shared player_game_logs table.
+
+    Returns:
+        str: The storage mode.
+
+    Raises:
+        ValueError: If the environment variable holds an unknown mode.
+    """
+    storage = os.environ.get("PLAYER_GAME_LOG_STORAGE", PER_PLAYER_STORAGE).strip().lower()
+    if storage not in (PER_PLAYER_STORAGE, PARTITIONED_STORAGE):
+        raise ValueError(f"Unknown PLAYER_GAME_LOG_STORAGE mode: {storage}")
+    return storage
 
 def is_player_database_populated(session: Session) -> bool:
     """
@@ -16,9 +42,24 @@ def is_player_database_populated(session: Session) -> bool:
     """
     return session.query(PlayerBasicInfo).first() is not None
 
+def create_player_tables(engine: Engine) -> None:
+    """
+    Creates the player_data tables that do not exist yet, converts json columns of existing
+    tables to jsonb and creates missing indexes.
+
+    Args:
+        engine: The SQLAlchemy engine instance.
+    """
+    BasePlayer.metadata.create_all(engine)
+    BaseState.metadata.create_all(engine)
+    # Databases created before the payloads were stored as JSONB are converted in place.
+    migrate_json_columns(engine)
+    create_indexes(engine, [PlayerBasicInfo.__table__])
+
 def initialize_player_database(db_url: str = None) -> Engine:
     """
-    Initializes the player_data database engine and creates all tables if not already present.
+    Returns the shared player_data database engine. The first call in a process creates the engine
+    and any missing tables; later calls reuse it and its connection pool.
     
     Args:
         db_url (str, optional): The database URL. If None, uses the PLAYER_DATABASE_URL environment variable.
@@ -33,13 +74,12 @@ def initialize_player_database(db_url: str = None) -> Engine:
         db_url = os.environ.get("PLAYER_DATABASE_URL")
         if not db_url:
             raise ValueError("PLAYER_DATABASE_URL environment variable is not set.")
-    engine = create_engine(db_url)
-    BasePlayer.metadata.create_all(engine)
-    return engine
+    return get_engine(db_url, setup=create_player_tables)
 
 def get_player_session(engine: Engine) -> Session:
     """
     Creates and returns a new SQLAlchemy session for the player_data database.
+    The caller must close it; prefer player_session_scope, which does.
     
     Args:
         engine: The SQLAlchemy engine instance.
@@ -47,5 +87,37 @@ def get_player_session(engine: Engine) -> Session:
     Returns:
         session: A new SQLAlchemy session.
     """
-    SessionLocal = sessionmaker(bind=engine)
-    return SessionLocal()
\ No newline at end of file
+    return get_session_factory(engine)()
+
+def player_session_scope(engine: Engine) -> ContextManager[Session]:
+    """
+    Opens a session for the player_data database that is closed, and rolled back on error,
+    when the with block exits.
+
+    Args:
+        engine: The SQLAlchemy engine instance.
+
+    Returns:
+        A context manager yielding the session.
+    """
+    return session_scope(engine)
+
+def create_player_game_log_partitions(engine: Engine, seasons: Iterable[int]) -> None:
+    """
+    Creates the per-season partitions of the player_game_logs table if they do not exist.
+    Each partition covers a single season: [season, season + 1).
+    Does nothing on non-PostgreSQL engines, where the table is not partitioned.
+
+    Args:
+        engine: The SQLAlchemy engine instance.
+        seasons: The seasons that need a partition.
+    """
+    if engine.dialect.name != "postgresql":
+        return
+    parent = PlayerGameLog.__tablename__
+    with engine.begin() as conn:
+        for season in sorted({int(s) for s in seasons}):
+            conn.execute(text(
+                f'CREATE TABLE IF NOT EXISTS "{parent}_{season}" PARTITION OF "{parent}" '
+                f'FOR VALUES FROM ({season}) TO ({season + 1})'
+            ))
@@ -1,12 +1,32 @@
+import os
 import math
+import zlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from contextlib import nullcontext
+from typing import Iterable, Iterator, Optional
+import numpy as np
 import pandas as pd
-import nfl_data_py as nfl
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 from sqlalchemy.engine import Engine
-from .database import get_player_session
-from .models import PlayerBasicInfo, create_player_game_log_model
-from utils import clean_date_field, clean_optional_int, clean_optional_float
+from .database import (player_session_scope, get_player_game_log_storage,
+                       create_player_game_log_partitions, PARTITIONED_STORAGE)
+from .models import (PlayerBasicInfo, PlayerGameLog, PlayerSeasonStats, PlayerCumulativeStats,
+                     create_player_game_log_model)
+from utils import (clean_optional_int, clean_optional_float, clean_date_column, clean_optional_int_column,
+                   clean_optional_float_column, column_values)
+from loader import BulkLoader, bulk_load
+from model_registry import ModelRegistry
+from schema import (PASSING_STAT_FIELDS, RUSHING_STAT_FIELDS, RECEIVING_STAT_FIELDS, EXTRA_DATA_FIELDS,
+                    WEEKLY_STAT_COLUMNS, WEEKLY_STAT_TYPES)
+from season_stats import (aggregate_season_stats, accumulate_season_stats, season_records, replace_season_records,
+                          replace_weekly_records)
+from pipeline import run_pipeline, season_chunks
+from data_context import DataContext, select_seasons
+from ingestion_state import (set_watermark, watermark_from_frame, filter_since_watermark, Watermark,
+                             PLAYER_GAME_LOGS, ROSTERS)
 
 def extract_bye_weeks(schedule_df: pd.DataFrame) -> dict:
     """
@@ -58,38 +78,88 @@ def ingest_player_basic_info(session: Session, roster_df: pd.DataFrame) -> None:
         return
 
     print(f"[DEBUG] Starting to ingest players.")
-    roster_df = roster_df.drop_duplicates(subset=['player_id'], keep='last')
-    records = []
-    for _, row in roster_df.iterrows():
-        player_id = row.get('player_id')
-        info = {
-            "name": row.get('player_name'),
-            "position": row.get('position'),
-            "birth_date": str(clean_date_field(row.get('birth_date'))) if row.get('birth_date') is not None else None,
-            "team": row.get('team'),
-            "rookie_year": clean_optional_int(row.get('rookie_year')),
-            "entry_year": clean_optional_int(row.get('entry_year')),
-            "status": row.get('status'),
-            "jersey_number": clean_optional_int(row.get('jersey_number'))
-        }
-        records.append({
-            "id": player_id,
-            "info": info
-        })
-
-    session.bulk_insert_mappings(PlayerBasicInfo, records)
-    session.commit()
+    records = create_player_info_records(roster_df)
+    bulk_load(session, PlayerBasicInfo, records)
     print(f"[DEBUG] Ingested {len(records)} player basic info records.")
 
 
+def create_player_info_records(roster_df: pd.DataFrame) -> list:
+    """
+    Creates player_basic_info records from roster data, keeping the last roster entry per player.
+
+    Args:
+        roster_df (pd.DataFrame): DataFrame containing player roster information.
+
+    Returns:
+        list: Records with the player's id and info dictionary.
+    """
+    roster_df = roster_df.drop_duplicates(subset=['player_id'], keep='last')
+
+    def raw(column: str) -> list:
+        return roster_df[column].tolist() if column in roster_df.columns else [None] * len(roster_df)
+
+    def cleaned(column: str, clean) -> list:
+        return column_values(clean(roster_df[column])) if column in roster_df.columns else [None] * len(roster_df)
+
+    # A missing birth date is stored as the string "None", as it always has been; only a
+    # birth_date that is None itself (or no birth_date column) is stored as null.
+    birth_dates = [None if value is None else str(date)
+                   for value, date in zip(raw('birth_date'), cleaned('birth_date', clean_date_column))]
+
+    columns = zip(
+        raw('player_id'), raw('player_name'), raw('position'),
+        birth_dates, raw('team'),
+        cleaned('rookie_year', clean_optional_int_column), cleaned('entry_year', clean_optional_int_column),
+        raw('status'), cleaned('jersey_number', clean_optional_int_column),
+    )
+    keys = ("name", "position", "birth_date", "team", "rookie_year", "entry_year", "status", "jersey_number")
+    return [{"id": values[0], "info": dict(zip(keys, values[1:]))} for values in columns]
+
+
+# Per-player game log models declared so far, and the tables known to exist in each database.
+GAME_LOG_MODELS = ModelRegistry(create_player_game_log_model)
+
+def get_game_log_model(player_id: str, engine: Engine):
+    """
+    Returns the ORM model that stores the given player's game logs for the configured storage mode.
+    In "per_player" mode the player's {player_id}_game_logs table is created if needed;
+    in "partitioned" mode the shared PlayerGameLog model is returned.
+
+    Args:
+        player_id (str): The player's unique identifier.
+        engine (Engine): SQLAlchemy engine for the player_data database.
+
+    Returns:
+        The ORM model class for the player's game logs.
+    """
+    if get_player_game_log_storage() == PARTITIONED_STORAGE:
+        return PlayerGameLog
+    return GAME_LOG_MODELS.get(player_id, engine)
+
+
+def create_game_log_tables(player_ids: Iterable[str], engine: Engine) -> None:
+    """
+    Creates the missing {player_id}_game_logs tables of several players in one transaction.
+    Does nothing in "partitioned" mode, where every player shares the player_game_logs table.
+
+    Args:
+        player_ids (Iterable[str]): The players about to be written.
+        engine (Engine): SQLAlchemy engine for the player_data database.
+    """
+    if get_player_game_log_storage() != PARTITIONED_STORAGE:
+        GAME_LOG_MODELS.ensure_tables(engine, player_ids)
+
+
 def ingest_player_game_logs(session: Session, game_logs_df: pd.DataFrame, engine: Engine, bye_weeks: dict) -> None:
     """
-    Ingests player game log data into dynamically created game log tables.
+    Ingests player game log data into the player game log table(s) of the configured storage mode,
+    and replaces the player_season_stats and player_cumulative_stats rows of its seasons.
 
     Args:
         session (Session): SQLAlchemy session for the player_data database.
         game_logs_df (pd.DataFrame): DataFrame containing player game log data.
         engine (Engine): SQLAlchemy engine for the player_data database (to create dynamic tables).
+        bye_weeks (dict): (team, season) -> list of bye weeks, from extract_bye_weeks.
     """
     if game_logs_df.empty:
         print("[DEBUG] No player game logs data available.")
@@ -98,29 +168,41 @@ def ingest_player_game_logs(session: Session, game_logs_df: pd.DataFrame, engine
     print(f"[DEBUG] Starting individual player ingestion")
     print(f"[DEBUG] This usually takes a while")
 
-    # Group game logs by player_id
-    grouped = game_logs_df.groupby('player_id')
-    for player_id, group in grouped:
-        # Fill missing weeks with "void" rows
-        group = fill_missing_weeks_for_player(group, bye_weeks)
-        group = group.drop_duplicates(
-            subset=['season', 'week', 'season_type'],
-            keep='last'
-        )
-        # Dynamically create the model/table for this player
-        GameLogModel = create_player_game_log_model(player_id)
-        GameLogModel.__table__.create(bind=engine, checkfirst=True)
+    if get_player_game_log_storage() == PARTITIONED_STORAGE:
+        create_player_game_log_partitions(engine, game_logs_df['season'].unique())
+
+    # Players are transformed in parallel shards; this process is the single writer
+    loaded = write_player_game_logs(session, engine, transform_player_game_logs(game_logs_df, bye_weeks))
+    seasons = game_logs_df['season'].unique()
+    replace_season_records(session, PlayerSeasonStats, seasons, aggregate_player_season_stats(game_logs_df))
+    replace_weekly_records(session, PlayerCumulativeStats, seasons, accumulate_player_stats(game_logs_df))
+    session.commit()
+
+    print(f"[DEBUG] Finished player ingestion, loaded {loaded} game logs")
 
-        # Build records using the helper function create_record
-        records = []
-        for _, row in group.iterrows():
-            records.append(create_record(player_id, row))
 
-        # Bulk insert the player's game log records
-        session.bulk_insert_mappings(GameLogModel, records)
-        session.commit()
+def write_player_game_logs(session: Session, engine: Engine, transformed: Iterable) -> int:
+    """
+    Writes transformed player game logs in large batches across players.
 
-    print(f"[DEBUG] Finished player ingestion")
+    Args:
+        session (Session): SQLAlchemy session for the player_data database.
+        engine (Engine): SQLAlchemy engine for the player_data database (to create dynamic tables).
+        transformed (Iterable): (player_id, records) pairs from transform_player_game_logs.
+
+    Returns:
+        int: The number of game logs loaded.
+    """
+    transformed = list(transformed)
+    create_game_log_tables((player_id for player_id, _ in transformed), engine)
+    with BulkLoader(session) as loader:
+        for player_id, records in transformed:
+            # Resolve the model/table holding this player's logs
+            GameLogModel = get_game_log_model(player_id, engine)
+
+            # Queue the player's game log records for the bulk loader
+            loader.add(GameLogModel, records)
+    return loader.loaded_rows
 
 
 def create_record(player_id: str, row: pd.Series) -> dict:
@@ -207,6 +289,99 @@ def create_record(player_id: str, row: pd.Series) -> dict:
         "extra_data": extra_data
     }
 
+def clean_stat_column(df: pd.DataFrame, column: str, cast: type) -> (np.ndarray, np.ndarray):
+    """
+    Cleans and casts a single stat column with utils.clean_optional_int_column or
+    clean_optional_float_column, mirroring clean_optional_int / clean_optional_float applied cell by cell.
+    Missing columns are treated as all zeros, unparseable values as None.
+
+    Args:
+        df (pd.DataFrame): Game log data.
+        column (str): The stat column to clean.
+        cast (type): int or float.
+
+    Returns:
+        tuple:
+            values (np.ndarray): Object array of Python ints/floats, with None for missing values.
+            blank (np.ndarray): Boolean array, True where the value is 0 or None.
+    """
+    if column not in df.columns:
+        return np.array([0] * len(df) if cast is int else [0.0] * len(df), dtype=object), np.ones(len(df), dtype=bool)
+
+    cleaned = (clean_optional_int_column if cast is int else clean_optional_float_column)(df[column])
+    missing = cleaned.isna().to_numpy()
+    numeric = cleaned.to_numpy(dtype='int64' if cast is int else 'float64', na_value=0)
+    values = numeric.astype(object)
+    values[missing] = None
+    return values, missing | (numeric == 0)
+
+
+def build_stat_payloads(df: pd.DataFrame, fields: dict) -> list:
+    """
+    Builds one stat payload dictionary per row of df for the given field layout.
+    Rows whose values are all 0 or None get None instead of a dictionary,
+    matching the "all zero -> NULL" rule of create_record.
+
+    Args:
+        df (pd.DataFrame): Game log data.
+        fields (dict): Payload key -> (source column, cast type).
+
+    Returns:
+        list: A payload dictionary (or None) per row.
+    """
+    keys = list(fields)
+    columns = []
+    blank = np.ones(len(df), dtype=bool)
+    for column, cast in fields.values():
+        values, column_blank = clean_stat_column(df, column, cast)
+        columns.append(values)
+        blank &= column_blank
+
+    return [
+        None if is_blank else dict(zip(keys, values))
+        for is_blank, values in zip(blank.tolist(), zip(*columns))
+    ]
+
+
+def create_records(game_logs_df: pd.DataFrame, player_id: str = None) -> list:
+    """
+    Vectorized equivalent of calling create_record on every row of game_logs_df.
+    Each stat column is cleaned and cast once for the whole DataFrame, and the
+    passing/rushing/receiving/extra payloads are built for all rows in one pass.
+    The returned records are identical to those of create_record.
+
+    Args:
+        game_logs_df (pd.DataFrame): Game log data for one or many players.
+        player_id (str, optional): Player ID for every record. If None, the
+            player_id column of game_logs_df is used.
+
+    Returns:
+        list: Records suitable for insertion into the player game log tables.
+    """
+    if game_logs_df.empty:
+        return []
+
+    n = len(game_logs_df)
+    player_ids = [player_id] * n if player_id is not None else game_logs_df['player_id'].tolist()
+    opponents = game_logs_df['opponent_team'].tolist() if 'opponent_team' in game_logs_df.columns else [None] * n
+    teams = game_logs_df['recent_team'].tolist() if 'recent_team' in game_logs_df.columns else [None] * n
+
+    columns = zip(
+        player_ids,
+        game_logs_df['season'].astype('int64').tolist(),
+        game_logs_df['week'].astype('int64').tolist(),
+        game_logs_df['season_type'].tolist(),
+        opponents,
+        teams,
+        build_stat_payloads(game_logs_df, PASSING_STAT_FIELDS),
+        build_stat_payloads(game_logs_df, RUSHING_STAT_FIELDS),
+        build_stat_payloads(game_logs_df, RECEIVING_STAT_FIELDS),
+        build_stat_payloads(game_logs_df, EXTRA_DATA_FIELDS),
+    )
+    keys = ("player_id", "season", "week", "season_type", "opponent_team", "team",
+            "passing_stats", "rushing_stats", "receiving_stats", "extra_data")
+    return [dict(zip(keys, values)) for values in columns]
+
 
 def fill_missing_weeks_for_player(player_df: pd.DataFrame, bye_weeks: dict) -> pd.DataFrame:
     """
@@ -214,92 +389,329 @@ def fill_missing_weeks_for_player(player_df: pd.DataFrame, bye_weeks: dict) -> p
     grouping and inserts a 'void' row for each missing game. A void row has zeros for numeric stats
     and None for non-numeric fields.
 
+    Kept for compatibility; delegates to fill_missing_weeks, which handles any number of players.
+
     Args:
         player_df (pd.DataFrame): A subset of game_logs_df for a single player.
 
     Returns:
         pd.DataFrame: The player_df with missing weeks filled in.
     """
-    all_rows = []
-    for (season_val, season_type_val, recent_team_val), subdf in player_df.groupby(['season', 'season_type', 'recent_team']):
-        present_weeks = subdf['week'].unique()
-        min_week, max_week = present_weeks.min(), present_weeks.max()
-        all_rows.append(subdf)
-        full_range = range(min_week, max_week + 1)
-        missing = sorted(set(full_range) - set(present_weeks))
-        # Build key for bye week lookup
-        bye_key = (recent_team_val, season_val)
-        for w in missing:
-            void_row = {
-                'player_id': subdf['player_id'].iloc[0],
-                'season': season_val,
-                'season_type': season_type_val,
-                'week': w,
-                # Set opponent_team to 'BYE' if the bye_weeks dictionary indicates a bye this week.
-                'opponent_team': 'BYE' if bye_key in bye_weeks and w in bye_weeks[bye_key] else None,
-                'recent_team': recent_team_val,
-                # All numeric stats set to zero.
-                'completions': 0,
-                'attempts': 0,
-                'passing_yards': 0,
-                'passing_tds': 0,
-                'interceptions': 0,
-                'sacks': 0,
-                'sack_yards': 0,
-                'sack_fumbles': 0,
-                'sack_fumbles_lost': 0,
-                'passing_air_yards': 0,
-                'passing_yards_after_catch': 0,
-                'passing_first_downs': 0,
-                'passing_epa': 0,
-                'passing_2pt_conversions': 0,
-                'carries': 0,
-                'rushing_yards': 0,
-                'rushing_tds': 0,
-                'rushing_fumbles': 0,
-                'rushing_fumbles_lost': 0,
-                'rushing_first_downs': 0,
-                'rushing_epa': 0,
-                'rushing_2pt_conversions': 0,
-                'receptions': 0,
-                'targets': 0,
-                'receiving_yards': 0,
-                'receiving_tds': 0,
-                'receiving_fumbles': 0,
-                'receiving_fumbles_lost': 0,
-                'receiving_air_yards': 0,
-                'receiving_yards_after_catch': 0,
-                'receiving_first_downs': 0,
-                'receiving_epa': 0,
-                'receiving_2pt_conversions': 0,
-                'special_teams_tds': 0,
-            }
-            all_rows.append(pd.DataFrame([void_row]))
-    return pd.concat(all_rows, ignore_index=True) if all_rows else player_df
-
-
-
-def ingest_player_data(years: list = [2022, 2023, 2024], engine: Engine = None) -> None:
+    return fill_missing_weeks(player_df, bye_weeks)
+
+
+GAME_LOG_KEYS = ['player_id', 'season', 'season_type', 'recent_team']
+VOID_STAT_COLUMNS = WEEKLY_STAT_COLUMNS
+
+
+def bye_weeks_to_frame(bye_weeks: dict) -> pd.DataFrame:
+    """
+    Flattens the bye week dictionary from extract_bye_weeks into a joinable table.
+
+    Args:
+        bye_weeks (dict): (team, season) -> list of bye weeks.
+
+    Returns:
+        pd.DataFrame: One row per bye week with columns recent_team, season, week.
+    """
+    rows = [(team, season, week) for (team, season), weeks in bye_weeks.items() for week in weeks]
+    return pd.DataFrame(rows, columns=['recent_team', 'season', 'week']).astype({'season': 'int64', 'week': 'int64'})
+
+
+def fill_missing_weeks(game_logs_df: pd.DataFrame, bye_weeks: dict) -> pd.DataFrame:
+    """
+    Vectorized version of fill_missing_weeks_for_player for the full weekly dataset.
+
+    Builds the week grid of every (player_id, season, season_type, recent_team) group
+    from its first to its last played week, anti-joins it against the weeks present
+    and inserts a 'void' row for each missing week. Void rows are marked 'BYE' by
+    joining against the bye week table and have all stats zero-filled. Rows come back
+    in the same order as calling fill_missing_weeks_for_player on each player in turn.
+
+    Args:
+        game_logs_df (pd.DataFrame): Weekly game log data for any number of players.
+        bye_weeks (dict): (team, season) -> list of bye weeks, from extract_bye_weeks.
+
+    Returns:
+        pd.DataFrame: game_logs_df with missing weeks filled in, sorted by player.
+    """
+    if game_logs_df.empty:
+        return game_logs_df
+
+    df = game_logs_df.reset_index(drop=True)
+    df['_order'] = np.arange(len(df))
+    valid = df[GAME_LOG_KEYS].notna().all(axis=1)
+    present = df[valid]
+
+    # Players without a single complete key are passed through untouched.
+    passthrough = df[df['player_id'].notna() & ~df['player_id'].isin(present['player_id'].unique())]
+
+    # Week grid from the first to the last played week of every group.
+    bounds = present.groupby(GAME_LOG_KEYS, observed=True)['week'].agg(['min', 'max']).reset_index()
+    span = (bounds['max'] - bounds['min'] + 1).to_numpy(dtype='int64')
+    grid = bounds.loc[bounds.index.repeat(span), GAME_LOG_KEYS].reset_index(drop=True)
+    offsets = np.arange(span.sum()) - np.repeat(np.cumsum(span) - span, span)
+    grid['week'] = np.repeat(bounds['min'].to_numpy(dtype='int64'), span) + offsets
+
+    # Anti-join against the weeks that were played.
+    played = present[GAME_LOG_KEYS + ['week']].drop_duplicates()
+    grid = grid.merge(played, on=GAME_LOG_KEYS + ['week'], how='left', indicator=True)
+    voids = grid[grid['_merge'] == 'left_only'].drop(columns='_merge')
+
+    # Mark bye weeks and zero-fill the stats.
+    bye_df = bye_weeks_to_frame(bye_weeks)
+    bye_df['_bye'] = True
+    voids = voids.merge(bye_df, on=['recent_team', 'season', 'week'], how='left')
+    voids['opponent_team'] = np.where(voids['_bye'].eq(True), 'BYE', None)
+    voids = voids[['player_id', 'season', 'season_type', 'week', 'opponent_team', 'recent_team']]
+    voids = voids.assign(**{column: 0 for column in VOID_STAT_COLUMNS})
+    voids['_order'] = voids['week'].to_numpy()
+
+    # Groups are ordered by sorting their keys: pandas 1.5's ngroup does not number groups of
+    # several categorical keys in sorted order.
+    filled = pd.concat([present.assign(_void=0), voids.assign(_void=1)], ignore_index=True)
+    filled = filled.sort_values(GAME_LOG_KEYS + ['_void', '_order'], kind='mergesort')
+    filled = pd.concat([filled, passthrough], ignore_index=True).sort_values('player_id', kind='mergesort')
+    return filled.drop(columns=['_order', '_void']).reset_index(drop=True)
+
+
+DEFAULT_TRANSFORM_SHARDS = 64
+
+# Most worker processes used by default. Each one holds its own copy of pandas and a shard,
+# so the default stays small to fit the memory target (see the Aggregator section of the README).
+DEFAULT_MAX_TRANSFORM_WORKERS = 2
+
+def get_transform_workers() -> int:
+    """
+    Returns the number of worker processes used to transform player game logs.
+
+    Reads the AGGREGATOR_TRANSFORM_WORKERS environment variable, defaulting to the number of CPUs
+    up to DEFAULT_MAX_TRANSFORM_WORKERS. A value of 1 transforms every player in the current process.
+
+    Returns:
+        int: The number of worker processes.
+    """
+    default = min(DEFAULT_MAX_TRANSFORM_WORKERS, os.cpu_count() or 1)
+    return max(1, int(os.environ.get("AGGREGATOR_TRANSFORM_WORKERS", default)))
+
+def get_transform_shards() -> int:
+    """
+    Returns the number of shards players are split into for the parallel transform.
+    The shard count, not the worker count, decides the order records are produced in.
+
+    Reads the AGGREGATOR_TRANSFORM_SHARDS environment variable, defaulting to 64.
+
+    Returns:
+        int: The number of shards.
+    """
+    return max(1, int(os.environ.get("AGGREGATOR_TRANSFORM_SHARDS", DEFAULT_TRANSFORM_SHARDS)))
+
+def player_shard(player_id, shards: int) -> int:
+    """
+    Returns the shard a player belongs to. CRC32 is used instead of hash(), which is salted per
+    process, so a player lands in the same shard in every run and every worker.
+
+    Args:
+        player_id: The player's unique identifier.
+        shards (int): The number of shards.
+
+    Returns:
+        int: The shard number.
+    """
+    return zlib.crc32(str(player_id).encode()) % shards
+
+def transform_game_log_shard(game_logs_df: pd.DataFrame, bye_weeks: dict) -> list:
+    """
+    Fills missing weeks and builds the game log records of every player in a DataFrame.
+    Runs in the worker processes, so it only uses its arguments.
+
+    Args:
+        game_logs_df (pd.DataFrame): Weekly game log data for any number of players.
+        bye_weeks (dict): (team, season) -> list of bye weeks, from extract_bye_weeks.
+
+    Returns:
+        list: (player_id, records) pairs, in player order.
+    """
+    game_logs_df = fill_missing_weeks(game_logs_df, bye_weeks)
+    game_logs_df = game_logs_df.drop_duplicates(
+        subset=['player_id', 'season', 'week', 'season_type'],
+        keep='last'
+    )
+    return [(player_id, create_records(group, player_id))
+            for player_id, group in game_logs_df.groupby('player_id', sort=False)]
+
+def create_transform_executor(workers: int = None) -> Optional[ProcessPoolExecutor]:
+    """
+    Creates the process pool used by transform_player_game_logs, so it can be reused across calls.
+    The pool uses the spawn start method because ingestion may run on a thread next to other stages.
+
+    Args:
+        workers (int, optional): Worker processes. Defaults to get_transform_workers().
+
+    Returns:
+        ProcessPoolExecutor, or None when a single worker is configured.
+    """
+    workers = workers or get_transform_workers()
+    if workers == 1:
+        return None
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+def transform_player_game_logs(game_logs_df: pd.DataFrame, bye_weeks: dict, workers: int = None,
+                               shards: int = None, executor: ProcessPoolExecutor = None) -> Iterator:
+    """
+    Transforms player game logs into records, sharding players by hash across worker processes.
+
+    Every step of the transform is per player, so each shard is transformed independently.
+    Shards are yielded in shard order and players in player order within a shard, so the
+    output is deterministic for a given shard count whatever the number of workers.
+
+    Args:
+        game_logs_df (pd.DataFrame): Weekly game log data for any number of players.
+        bye_weeks (dict): (team, season) -> list of bye weeks, from extract_bye_weeks.
+        workers (int, optional): Worker processes. Defaults to get_transform_workers().
+        shards (int, optional): Number of shards. Defaults to get_transform_shards().
+        executor (ProcessPoolExecutor, optional): Pool from create_transform_executor. Defaults to a
+            pool created for this call.
+
+    Yields:
+        (player_id, records) pairs.
+    """
+    if game_logs_df.empty:
+        return
+    if executor is None:
+        executor = create_transform_executor(workers)
+        if executor is None:
+            yield from transform_game_log_shard(game_logs_df, bye_weeks)
+            return
+        with executor:
+            yield from transform_player_game_logs(game_logs_df, bye_weeks, workers, shards, executor)
+        return
+
+    shards = shards or get_transform_shards()
+    player_ids = game_logs_df['player_id']
+    shard_of = {player_id: player_shard(player_id, shards) for player_id in player_ids.dropna().unique()}
+    shard_ids = player_ids.map(shard_of).fillna(0).astype(int)
+    shard_dfs = [shard_df for _, shard_df in game_logs_df.groupby(shard_ids, sort=True)]
+    print(f"[DEBUG] Transforming {len(shard_of)} players in {len(shard_dfs)} shards.")
+
+    for shard_records in executor.map(transform_game_log_shard, shard_dfs, repeat(bye_weeks)):
+        yield from shard_records
+
+
+PLAYER_SEASON_KEYS = ['player_id', 'season', 'season_type']
+
+def player_games(game_logs_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Returns one row per game played from weekly game logs, in week order: the season keys,
+    week, recent_team and every weekly stat as a number. Only weeks the player appears in the
+    weekly data are games played; filled void and bye weeks are not.
+
+    Args:
+        game_logs_df (pd.DataFrame): Weekly game log data.
+
+    Returns:
+        pd.DataFrame: The games.
+    """
+    games = game_logs_df.drop_duplicates(subset=['player_id', 'season', 'week', 'season_type'], keep='last')
+    games = games.sort_values(['season', 'week'], kind='stable')
+    stats = {
+        column: pd.to_numeric(games[column], errors='coerce') if column in games.columns else 0.0
+        for column in WEEKLY_STAT_TYPES
+    }
+    return games[PLAYER_SEASON_KEYS + ['week', 'recent_team']].assign(**stats)
+
+def aggregate_player_season_stats(game_logs_df: pd.DataFrame) -> list:
+    """
+    Aggregates weekly game logs into player_season_stats records.
+
+    Args:
+        game_logs_df (pd.DataFrame): Weekly game log data covering whole seasons.
+
+    Returns:
+        list: One record per (player_id, season, season_type).
+    """
+    if game_logs_df.empty:
+        return []
+    games = player_games(game_logs_df)
+    season = aggregate_season_stats(games, PLAYER_SEASON_KEYS, WEEKLY_STAT_TYPES)
+    # The player's team in their last game of the season
+    teams = games.groupby(PLAYER_SEASON_KEYS, observed=True, sort=False)['recent_team'].last().rename('team')
+    season = season.merge(teams.reset_index(), on=PLAYER_SEASON_KEYS, how='left')
+    return season_records(season)
+
+def accumulate_player_stats(game_logs_df: pd.DataFrame, watermark: Optional[Watermark] = None) -> list:
+    """
+    Computes player_cumulative_stats records from weekly game logs.
+
+    Args:
+        game_logs_df (pd.DataFrame): Weekly game log data covering whole seasons.
+        watermark (Watermark, optional): Only rows since the watermark are returned. Defaults to every row.
+
+    Returns:
+        list: One record per game played.
+    """
+    if game_logs_df.empty:
+        return []
+    accumulated = accumulate_season_stats(player_games(game_logs_df), PLAYER_SEASON_KEYS, WEEKLY_STAT_TYPES)
+    return season_records(filter_since_watermark(accumulated, watermark))
+
+def ingest_player_data(years: list = [2022, 2023, 2024], engine: Engine = None,
+                       context: DataContext = None) -> None:
     """
     Main function to ingest player data using the nfl-data-py library.
     Imports player rosters and game log data, then processes and ingests the data
     into the player_data database.
 
+    Rosters are ingested first, since game logs reference them. Game logs are then ingested one
+    chunk of seasons at a time (see season_chunks) through a pipeline: the next chunk is fetched
+    while the current one is transformed and the previous one is written, and the watermark
+    advances after each chunk. Missing weeks are filled per season, so the result matches
+    ingesting every season at once. Each chunk's player_season_stats and player_cumulative_stats
+    rows are written with its game logs.
+
     Args:
         years (list, optional): List of years for which to import data.
         engine (Engine, optional): SQLAlchemy engine for the player_data database.
+        context (DataContext, optional): Shared data context covering years, or a
+            SharedSeasonContexts view whose chunk contexts are shared with another stage.
+            Defaults to fetching each season separately.
     """
     print("[DEBUG] Importing player roster data...")
-    roster_df = nfl.import_seasonal_rosters(years)
-    roster_df = nfl.clean_nfl_data(roster_df)
+    roster_df = select_seasons((context or DataContext(years)).rosters, years)
+    with player_session_scope(engine) as session:
+        ingest_player_basic_info(session, roster_df)
+        set_watermark(session, ROSTERS, watermark_from_frame(roster_df))
+    del roster_df
+
+    partitioned = get_player_game_log_storage() == PARTITIONED_STORAGE
+
+    def fetch(seasons):
+        print(f"[DEBUG] Importing player game log and schedule data for seasons {seasons}...")
+        season_context = context.subset(seasons) if context is not None else DataContext(seasons)
+        return season_context.weekly_data, season_context.bye_weeks
 
-    print("[DEBUG] Importing player game log data...")
-    game_logs_df = nfl.import_weekly_data(years)
+    def transform(seasons, data):
+        game_logs_df, bye_weeks = data
+        transformed = list(transform_player_game_logs(game_logs_df, bye_weeks, executor=executor))
+        return (watermark_from_frame(game_logs_df), transformed, aggregate_player_season_stats(game_logs_df),
+                accumulate_player_stats(game_logs_df))
 
-    print("[DEBUG] Importing schedule data for bye week info...")
-    schedule_df = nfl.import_schedules(years)
-    bye_weeks = extract_bye_weeks(schedule_df)
+    def write(seasons, result):
+        watermark, transformed, season_stats, cumulative_stats = result
+        if partitioned:
+            create_player_game_log_partitions(engine, seasons)
+        # Each chunk gets its own session, so the connection goes back to the pool between chunks.
+        with player_session_scope(engine) as session:
+            loaded = write_player_game_logs(session, engine, transformed)
+            replace_season_records(session, PlayerSeasonStats, seasons, season_stats)
+            replace_weekly_records(session, PlayerCumulativeStats, seasons, cumulative_stats)
+            # Commit the aggregates here: set_watermark does not commit when the watermark is unchanged.
+            session.commit()
+            # Record what was loaded so later updates (or a restarted ingest) start from here.
+            set_watermark(session, PLAYER_GAME_LOGS, watermark)
+        print(f"[DEBUG] Loaded {loaded} player game logs for seasons {seasons}.")
 
-    session = get_player_session(engine)
-    ingest_player_basic_info(session, roster_df)
-    ingest_player_game_logs(session, game_logs_df, engine, bye_weeks)
\ No newline at end of file
+    print("[DEBUG] Starting individual player ingestion")
+    with create_transform_executor() or nullcontext() as executor:
+        run_pipeline(season_chunks(years), fetch, transform, write)
+    print("[DEBUG] Finished player ingestion")
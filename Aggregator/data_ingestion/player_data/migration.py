@@ -0,0 +1,67 @@
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+from player_data.database import initialize_player_database, create_player_game_log_partitions
+from player_data.models import PlayerGameLog
+
+GAME_LOG_COLUMNS = (
+    "player_id", "season", "week", "season_type", "opponent_team", "team",
+    "passing_stats", "rushing_stats", "receiving_stats", "extra_data"
+)
+
+def find_per_player_game_log_tables(engine: Engine) -> list:
+    """
+    Lists the legacy per-player game log tables ({player_id}_game_logs) in the player_data database.
+
+    Args:
+        engine (Engine): SQLAlchemy engine for the player_data database.
+
+    Returns:
+        list: Sorted table names of the per-player game log tables.
+    """
+    shared = PlayerGameLog.__tablename__
+    return sorted(
+        name for name in inspect(engine).get_table_names()
+        if name.endswith("_game_logs") and name != shared
+    )
+
+def migrate_player_game_logs(engine: Engine, drop_source: bool = False) -> int:
+    """
+    Copies every per-player {player_id}_game_logs table into the shared, season-partitioned
+    player_game_logs table. Rows that already exist in player_game_logs are skipped, so the
+    migration can be re-run safely. Each source table is copied in its own transaction.
+
+    Args:
+        engine (Engine): SQLAlchemy engine for the player_data database.
+        drop_source (bool, optional): Drop each per-player table once it has been copied.
+
+    Returns:
+        int: The number of per-player tables migrated.
+    """
+    tables = find_per_player_game_log_tables(engine)
+    print(f"[DEBUG] Found {len(tables)} per-player game log tables to migrate.")
+
+    columns = ", ".join(GAME_LOG_COLUMNS)
+    shared = PlayerGameLog.__tablename__
+    for count, table in enumerate(tables, start=1):
+        with engine.connect() as conn:
+            seasons = [row[0] for row in conn.execute(text(f'SELECT DISTINCT season FROM "{table}"'))]
+        create_player_game_log_partitions(engine, seasons)
+
+        with engine.begin() as conn:
+            conn.execute(text(
+                f'INSERT INTO "{shared}" ({columns}) '
+                f'SELECT {columns} FROM "{table}" '
+                f'ON CONFLICT DO NOTHING'
+            ))
+            if drop_source:
+                conn.execute(text(f'DROP TABLE "{table}"'))
+
+        if count % 500 == 0:
+            print(f"[DEBUG] Migrated {count}/{len(tables)} per-player game log tables.")
+
+    print(f"[DEBUG] Player game log migration complete, migrated {len(tables)} tables.")
+    return len(tables)
+
+if __name__ == "__main__":
+    migrate_player_game_logs(initialize_player_database())
@@ -1,5 +1,8 @@
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy import Column, String, Integer, JSON, ForeignKeyConstraint
+from sqlalchemy import Column, String, Integer, ForeignKeyConstraint, Index, text
+from json_columns import JSONType
+from schema import WEEKLY_STAT_TYPES
+from season_stats import season_stat_columns, cumulative_stat_columns
 
 BasePlayer = declarative_base()
 
@@ -7,17 +10,104 @@ class PlayerBasicInfo(BasePlayer):
     """
     ORM model for the player_basic_info table.
     
-    Stores basic player information as a JSON object.
+    Stores basic player information as a JSON object (JSONB on PostgreSQL).
     """
     __tablename__ = 'player_basic_info'
     
+    # PostgreSQL only: expression indexes on the keys the API filters on (e.g. info->>'team' for
+    # team rosters), and a GIN index for containment queries such as info @> '{"position": "QB"}'.
+    # PostgreSQL requires an index expression that is not a function call to be parenthesized.
+    __table_args__ = (
+        Index('ix_player_basic_info_team', text("(info ->> 'team')")).ddl_if(dialect='postgresql'),
+        Index('ix_player_basic_info_position', text("(info ->> 'position')")).ddl_if(dialect='postgresql'),
+        Index('ix_player_basic_info_name', text("(info ->> 'name')")).ddl_if(dialect='postgresql'),
+        Index('ix_player_basic_info_info', 'info', postgresql_using='gin',
+              postgresql_ops={'info': 'jsonb_path_ops'}).ddl_if(dialect='postgresql'),
+    )
+
     id = Column(String(50), primary_key=True)
-    info = Column(JSON, nullable=False)
+    info = Column(JSONType, nullable=False)
     
     def __repr__(self) -> str:
         return f"<PlayerBasicInfo(id={self.id})>"
 
 
+class PlayerGameLog(BasePlayer):
+    """
+    ORM model for the shared player_game_logs table.
+
+    Stores the game logs of every player in a single table instead of one
+    {player_id}_game_logs table per player. On PostgreSQL the table is
+    range-partitioned by season; partitions are created per season by
+    create_player_game_log_partitions.
+    """
+    __tablename__ = 'player_game_logs'
+    __table_args__ = (
+        ForeignKeyConstraint(['player_id'], ['player_basic_info.id']),
+        {'postgresql_partition_by': 'RANGE (season)'},
+    )
+
+    player_id = Column(String(50), primary_key=True)
+    season = Column(Integer, primary_key=True)
+    week = Column(Integer, primary_key=True)
+    season_type = Column(String(10), primary_key=True)
+    opponent_team = Column(String(3), nullable=True)
+    team = Column(String(12), nullable=True)
+    passing_stats = Column(JSONType, nullable=True)
+    rushing_stats = Column(JSONType, nullable=True)
+    receiving_stats = Column(JSONType, nullable=True)
+    extra_data = Column(JSONType, nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<PlayerGameLog(player_id={self.player_id}, season={self.season}, week={self.week})>"
+
+
+class PlayerSeasonStats(BasePlayer):
+    """
+    ORM model for the player_season_stats table.
+
+    One row per (player_id, season, season_type) with the player's games played and, for every
+    weekly stat, its season total and per-game average. team is the player's team in their
+    last game of the season. Rows are replaced whenever their season is ingested or updated.
+    """
+    __tablename__ = 'player_season_stats'
+
+    player_id = Column(String(50), primary_key=True)
+    season = Column(Integer, primary_key=True)
+    season_type = Column(String(10), primary_key=True)
+    team = Column(String(12), nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<PlayerSeasonStats(player_id={self.player_id}, season={self.season})>"
+
+
+class PlayerCumulativeStats(BasePlayer):
+    """
+    ORM model for the player_cumulative_stats table.
+
+    One row per game a player played, keyed by (player_id, season, season_type, week), with the
+    games played and every weekly stat's total through that week (season to date), plus its
+    average over the player's last 3 and last 5 games of the season. The total of a week range
+    is the difference of two rows: the last row in the range minus the last row before it.
+    """
+    __tablename__ = 'player_cumulative_stats'
+
+    player_id = Column(String(50), primary_key=True)
+    season = Column(Integer, primary_key=True)
+    season_type = Column(String(10), primary_key=True)
+    week = Column(Integer, primary_key=True)
+
+    def __repr__(self) -> str:
+        return f"<PlayerCumulativeStats(player_id={self.player_id}, season={self.season}, week={self.week})>"
+
+
+# The stat columns follow the weekly stats, so they are added to the declared models in a loop.
+for stat_column, column in season_stat_columns(WEEKLY_STAT_TYPES).items():
+    setattr(PlayerSeasonStats, stat_column, column)
+for stat_column, column in cumulative_stat_columns(WEEKLY_STAT_TYPES).items():
+    setattr(PlayerCumulativeStats, stat_column, column)
+
+
 def create_player_game_log_model(player_id: str):
     """
     Dynamically creates an ORM model class for a player's game log table.
@@ -43,10 +133,10 @@ def create_player_game_log_model(player_id: str):
         'season_type': Column(String(10), primary_key=True),
         'opponent_team': Column(String(3), nullable=True),
         'team': Column(String(12), nullable=True),
-        'passing_stats': Column(JSON, nullable=True),
-        'rushing_stats': Column(JSON, nullable=True),
-        'receiving_stats': Column(JSON, nullable=True),
-        'extra_data': Column(JSON, nullable=True),
+        'passing_stats': Column(JSONType, nullable=True),
+        'rushing_stats': Column(JSONType, nullable=True),
+        'receiving_stats': Column(JSONType, nullable=True),
+        'extra_data': Column(JSONType, nullable=True),
         '__table_args__': (
             ForeignKeyConstraint(['player_id'], ['player_basic_info.id']),
         )
@@ -1,64 +1,107 @@
 import pandas as pd
-import nfl_data_py as nfl
 from sqlalchemy.orm import Session
 from sqlalchemy.engine import Engine
 
-from .database import get_player_session
-from .models import PlayerBasicInfo, create_player_game_log_model
-from player_data.ingestion import fill_missing_weeks_for_player, create_record, extract_bye_weeks
+from .database import player_session_scope, get_player_game_log_storage, create_player_game_log_partitions, PARTITIONED_STORAGE
+from .models import PlayerBasicInfo, PlayerGameLog, PlayerSeasonStats, PlayerCumulativeStats
+from player_data.ingestion import (fill_missing_weeks, create_records, get_game_log_model, create_game_log_tables,
+                                   create_player_info_records, aggregate_player_season_stats, accumulate_player_stats)
+from loader import insert_missing_records
+from season_stats import replace_season_records, replace_weekly_records
+from data_context import DataContext, select_seasons
+from ingestion_state import (get_watermark, set_watermark, watermark_from_frame, seasons_to_update,
+                             filter_since_watermark, PLAYER_GAME_LOGS, ROSTERS, DEFAULT_UPDATE_START_SEASON)
 
-def update_player_game_logs(engine: Engine, years: list):
+def update_player_basic_info(engine: Engine, years: list = None, context: DataContext = None):
     """
-    Update player game logs by comparing new data from nfl-data-py with existing records.
-    For each player, missing game logs are inserted.
+    Insert players that are not yet in the player_basic_info table, such as rookies.
+    Only the seasons since the rosters watermark are fetched.
+
+    Args:
+        engine (Engine): SQLAlchemy engine for the player_data database.
+        years (list, optional): Seasons to fetch. Defaults to the seasons since the watermark.
+        context (DataContext, optional): Shared data context covering years. Defaults to a new context.
+    """
+    print("[DEBUG] Updating player basic info...")
+    with player_session_scope(engine) as session:
+        watermark = get_watermark(session, ROSTERS)
+        years = years or seasons_to_update(watermark, DEFAULT_UPDATE_START_SEASON)
+        print(f"[DEBUG] Fetching rosters for seasons {years}.")
+
+        context = context or DataContext(years)
+        roster_df = select_seasons(context.rosters, years)
+
+        inserted = insert_missing_records(session, PlayerBasicInfo, create_player_info_records(roster_df))
+        session.commit()
+        set_watermark(session, ROSTERS, watermark_from_frame(roster_df))
+    print(f"[DEBUG] Player basic info update complete, inserted {inserted} players.")
+
+def update_player_game_logs(engine: Engine, years: list = None, context: DataContext = None):
+    """
+    Update player game logs with new data from nfl-data-py.
+    Only the seasons since the player game logs watermark are fetched, and only players with
+    games since the watermark are written. Rows are sent to the database with
+    INSERT ... ON CONFLICT DO NOTHING, so existing rows are never read back.
+    The player_season_stats rows of the seasons with games since the watermark are recomputed
+    from the fetched seasons and replaced, and their player_cumulative_stats rows are extended
+    with the weeks since the watermark.
     
     Args:
         engine (Engine): SQLAlchemy engine for the player_data database.
-        years (list): List of seasons to update.
+        years (list, optional): Seasons to fetch. Defaults to the seasons since the watermark.
+        context (DataContext, optional): Shared data context covering years. Defaults to a new context.
     """
     print("[DEBUG] Updating player game logs...")
-    # Import the latest weekly game logs and schedule data
-    new_game_logs_df = nfl.import_weekly_data(years)
-    schedule_df = nfl.import_schedules(years)
-    bye_weeks = extract_bye_weeks(schedule_df)
-    
-    session = get_player_session(engine)
-    # Retrieve all players from the basic info table
-    players = session.query(PlayerBasicInfo).all()
-    print(f"[DEBUG] Found {len(players)} players.")
-    count = 0
+    with player_session_scope(engine) as session:
+        watermark = get_watermark(session, PLAYER_GAME_LOGS)
+        years = years or seasons_to_update(watermark, DEFAULT_UPDATE_START_SEASON)
+        print(f"[DEBUG] Fetching player game logs for seasons {years} (watermark: {watermark}).")
 
-    for player in players:
-        player_id = player.id
-        # Filter new game logs to include only those for this player
-        player_game_logs_df = new_game_logs_df[new_game_logs_df['player_id'] == player_id]
-        if player_game_logs_df.empty:
-            continue
+        # Import the latest weekly game logs and schedule data
+        context = context or DataContext(years)
+        fetched_df = select_seasons(context.weekly_data, years)
+        bye_weeks = context.bye_weeks
 
-        # Fill missing weeks as per ingestion logic
-        player_game_logs_df = fill_missing_weeks_for_player(player_game_logs_df, bye_weeks)
-        player_game_logs_df = player_game_logs_df.drop_duplicates(
-            subset=['season', 'week', 'season_type'], keep='last'
+        # Fill missing weeks for every player at once, as per ingestion logic
+        new_game_logs_df = fill_missing_weeks(fetched_df, bye_weeks)
+        new_game_logs_df = new_game_logs_df.drop_duplicates(
+            subset=['player_id', 'season', 'week', 'season_type'], keep='last'
         )
-        
-        # Dynamically create the model for the player's game log table and ensure the table exists
-        GameLogModel = create_player_game_log_model(player_id)
-        GameLogModel.__table__.create(bind=engine, checkfirst=True)
-        
-        # Query existing game logs from the player's table
-        existing_logs = session.query(GameLogModel).all()
-        existing_keys = {(log.season, log.week, log.season_type) for log in existing_logs}
-        
-        # Prepare new records for missing games
-        new_records = []
-        for _, row in player_game_logs_df.iterrows():
-            key = (int(row['season']), int(row['week']), row['season_type'])
-            if key not in existing_keys:
-                new_records.append(create_record(player_id, row))
-        
-        if new_records:
-            count += 1
-            print(f"[DEBUG] Inserting {len(new_records)} new game log(s) for player {player_id}.")
-            session.bulk_insert_mappings(GameLogModel, new_records)
-            session.commit()
-    print(f"[DEBUG] Player game logs update complete, updated {count} players.")
\ No newline at end of file
+
+        # Keep the players with games since the watermark. All of their fetched rows are kept,
+        # since a new game can close a gap of void weeks that lie before the watermark.
+        recent_players = filter_since_watermark(new_game_logs_df, watermark)['player_id'].unique()
+        new_game_logs_df = new_game_logs_df[new_game_logs_df['player_id'].isin(recent_players)]
+
+        # Only players in the basic info table can have game logs
+        player_ids = {player_id for (player_id,) in session.query(PlayerBasicInfo.id)}
+        new_game_logs_df = new_game_logs_df[new_game_logs_df['player_id'].isin(player_ids)]
+        print(f"[DEBUG] Found {len(player_ids)} players, {len(new_game_logs_df)} fetched game logs to merge.")
+
+        inserted = 0
+        count = 0
+        if get_player_game_log_storage() == PARTITIONED_STORAGE:
+            create_player_game_log_partitions(engine, new_game_logs_df['season'].unique())
+            inserted = insert_missing_records(session, PlayerGameLog, create_records(new_game_logs_df))
+            count = new_game_logs_df['player_id'].nunique() if inserted else 0
+        else:
+            create_game_log_tables(new_game_logs_df['player_id'].unique(), engine)
+            for player_id, player_game_logs_df in new_game_logs_df.groupby('player_id', sort=False):
+                # Resolve the model/table holding the player's game logs, created above
+                GameLogModel = get_game_log_model(player_id, engine)
+                player_inserted = insert_missing_records(session, GameLogModel, create_records(player_game_logs_df, player_id))
+                if player_inserted:
+                    count += 1
+                    inserted += player_inserted
+                    print(f"[DEBUG] Inserted {player_inserted} new game log(s) for player {player_id}.")
+
+        # Re-aggregate only the seasons that have games since the watermark, and extend their
+        # season-to-date rows from the watermark's week on
+        changed_seasons = filter_since_watermark(fetched_df, watermark)['season'].unique()
+        changed_df = fetched_df[fetched_df['season'].isin(changed_seasons)]
+        replace_season_records(session, PlayerSeasonStats, changed_seasons, aggregate_player_season_stats(changed_df))
+        replace_weekly_records(session, PlayerCumulativeStats, changed_seasons,
+                               accumulate_player_stats(changed_df, watermark), watermark)
+        session.commit()
+        set_watermark(session, PLAYER_GAME_LOGS, watermark_from_frame(fetched_df))
+    print(f"[DEBUG] Player game logs update complete, inserted {inserted} game logs for {count} players.")
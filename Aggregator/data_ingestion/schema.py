@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+
+# Stats written to the player game log payloads: payload key -> (weekly data column, type).
+PASSING_STAT_FIELDS = {
+    "completions": ('completions', int),
+    "attempts": ('attempts', int),
+    "passing_yards": ('passing_yards', float),
+    "passing_tds": ('passing_tds', int),
+    "interceptions": ('interceptions', int),
+    "sacks": ('sacks', float),
+    "sack_yards": ('sack_yards', float),
+    "sack_fumbles": ('sack_fumbles', int),
+    "sack_fumbles_lost": ('sack_fumbles_lost', int),
+    "passing_air_yards": ('passing_air_yards', float),
+    "passing_yards_after_catch": ('passing_yards_after_catch', float),
+    "passing_first_downs": ('passing_first_downs', int),
+    "passing_epa": ('passing_epa', float),
+    "passing_2pt_conversions": ('passing_2pt_conversions', int),
+}
+RUSHING_STAT_FIELDS = {
+    "carries": ('carries', int),
+    "rushing_yards": ('rushing_yards', float),
+    "rushing_tds": ('rushing_tds', int),
+    "rushing_fumbles": ('rushing_fumbles', int),
+    "rushing_fumbles_lost": ('rushing_fumbles_lost', int),
+    "rushing_first_downs": ('rushing_first_downs', int),
+    "rushing_epa": ('rushing_epa', float),
+    "rushing_2pt_conversions": ('rushing_2pt_conversions', int),
+}
+RECEIVING_STAT_FIELDS = {
+    "receptions": ('receptions', int),
+    "targets": ('targets', int),
+    "receiving_yards": ('receiving_yards', float),
+    "receiving_tds": ('receiving_tds', int),
+    "receiving_fumbles": ('receiving_fumbles', int),
+    "receiving_fumbles_lost": ('receiving_fumbles_lost', int),
+    "receiving_air_yards": ('receiving_air_yards', float),
+    "receiving_yards_after_catch": ('receiving_yards_after_catch', float),
+    "receiving_first_downs": ('receiving_first_downs', int),
+    "receiving_epa": ('receiving_epa', float),
+    "receiving_2pt_conversions": ('receiving_2pt_conversions', int),
+}
+EXTRA_DATA_FIELDS = {
+    "special_teams_tds": ('special_teams_tds', int),
+}
+STAT_FIELDS = (PASSING_STAT_FIELDS, RUSHING_STAT_FIELDS, RECEIVING_STAT_FIELDS, EXTRA_DATA_FIELDS)
+
+# Identifying columns of a weekly data row.
+WEEKLY_KEY_COLUMNS = [
+    'player_id', 'player_name', 'position', 'recent_team', 'opponent_team', 'season', 'week', 'season_type'
+]
+WEEKLY_STAT_COLUMNS = [column for fields in STAT_FIELDS for column, _ in fields.values()]
+# Weekly data stat column -> int or float.
+WEEKLY_STAT_TYPES = {column: cast for fields in STAT_FIELDS for column, cast in fields.values()}
+
+# The weekly data columns the player and team pipelines read; everything else stays in the cache files.
+WEEKLY_COLUMNS = WEEKLY_KEY_COLUMNS + WEEKLY_STAT_COLUMNS
+
+# Low-cardinality string columns stored as categoricals.
+WEEKLY_CATEGORICAL_COLUMNS = ['position', 'recent_team', 'opponent_team', 'season_type']
+
+def compact_weekly_data(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Stores weekly data in compact dtypes: team, opponent, position and season_type become
+    categoricals, and integer columns such as season, week and counts are downcast to the smallest
+    integer type that holds them. Float columns are left as they are, so cleaned values and the
+    JSON written from them do not change.
+
+    Groupbys over the categorical columns must pass observed=True, otherwise every combination
+    of categories is produced.
+
+    Args:
+        df (pd.DataFrame): Weekly data from nfl_data_py.
+
+    Returns:
+        pd.DataFrame: The same data in compact dtypes.
+    """
+    if df.empty:
+        return df
+    compact = {}
+    for column in WEEKLY_CATEGORICAL_COLUMNS:
+        if column in df.columns and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            compact[column] = df[column].astype('category')
+    for column in df.columns:
+        if column not in compact and np.issubdtype(df[column].dtype, np.integer):
+            compact[column] = pd.to_numeric(df[column], downcast='integer')
+    return df.assign(**compact)
@@ -0,0 +1,164 @@
+from typing import Iterable, Optional
+import numpy as np
+import pandas as pd
+from sqlalchemy import Column, Integer, REAL, SmallInteger, and_, delete, insert, or_
+from sqlalchemy.orm import Session
+from ingestion_state import Watermark
+
+# Game counts of the rolling averages stored next to the season-to-date totals.
+ROLLING_WINDOWS = (3, 5)
+
+def season_stat_columns(stat_types: dict) -> dict:
+    """
+    Declares the columns of a season aggregate table: games_played, then for every stat its
+    season total and its per-game average ({stat}_per_game).
+
+    Args:
+        stat_types (dict): Stat name -> int or float, the type of its total.
+
+    Returns:
+        dict: Column name -> Column, for a declarative model body.
+    """
+    columns = {'games_played': Column(SmallInteger, nullable=False, default=0)}
+    for stat, cast in stat_types.items():
+        columns[stat] = Column(Integer if cast is int else REAL, nullable=False, default=0)
+        columns[f"{stat}_per_game"] = Column(REAL, nullable=False, default=0)
+    return columns
+
+def aggregate_season_stats(games: pd.DataFrame, keys: list, stat_types: dict) -> pd.DataFrame:
+    """
+    Sums one row per game into one row per season key, with games played and per-game averages.
+
+    Args:
+        games (pd.DataFrame): One row per game played.
+        keys (list): The season key columns, e.g. ['player_id', 'season', 'season_type'].
+        stat_types (dict): Stat name -> int or float, as passed to season_stat_columns.
+
+    Returns:
+        pd.DataFrame: The key columns, games_played, and each stat's total and per-game average.
+    """
+    stats = list(stat_types)
+    grouped = games.groupby(keys, observed=True, sort=False)
+    totals = grouped[stats].sum()
+    season = totals[[]].assign(games_played=grouped.size())
+    for stat, cast in stat_types.items():
+        total = totals[stat].astype('float64')
+        season[stat] = total.round().astype('int64') if cast is int else total
+        season[f"{stat}_per_game"] = total / season['games_played']
+    return season.reset_index()
+
+def cumulative_stat_columns(stat_types: dict) -> dict:
+    """
+    Declares the columns of a season-to-date table: games_played, then for every stat its total
+    through the row's week and its average over the last games of each ROLLING_WINDOWS size
+    ({stat}_last3, {stat}_last5).
+
+    Args:
+        stat_types (dict): Stat name -> int or float, the type of its total.
+
+    Returns:
+        dict: Column name -> Column, for a declarative model body.
+    """
+    columns = {'games_played': Column(SmallInteger, nullable=False, default=0)}
+    for stat, cast in stat_types.items():
+        columns[stat] = Column(Integer if cast is int else REAL, nullable=False, default=0)
+        for window in ROLLING_WINDOWS:
+            columns[f"{stat}_last{window}"] = Column(REAL, nullable=False, default=0)
+    return columns
+
+def accumulate_season_stats(games: pd.DataFrame, keys: list, stat_types: dict) -> pd.DataFrame:
+    """
+    Computes season-to-date totals and rolling averages, one row per game.
+
+    Totals are a grouped cumulative sum in week order. A rolling window's total is the
+    difference of two cumulative totals, the current one and the one window games earlier
+    (a grouped shift), so no per-group rolling computation is needed. Windows at the start of
+    a season average the games played so far.
+
+    Args:
+        games (pd.DataFrame): One row per game played, with the key columns and week.
+        keys (list): The season key columns, e.g. ['player_id', 'season', 'season_type'].
+        stat_types (dict): Stat name -> int or float, as passed to cumulative_stat_columns.
+
+    Returns:
+        pd.DataFrame: The key columns, week, games_played, and each stat's total and rolling averages.
+    """
+    stats = list(stat_types)
+    games = games.sort_values(keys + ['week'], kind='stable').reset_index(drop=True)
+    grouped = games.groupby(keys, observed=True, sort=False)
+    group_ids = grouped.ngroup()
+    played = grouped.cumcount().to_numpy() + 1
+    totals = games[stats].astype('float64').fillna(0).groupby(group_ids).cumsum()
+
+    shifted = {window: totals.groupby(group_ids).shift(window, fill_value=0) for window in ROLLING_WINDOWS}
+    # The columns are built first and joined once: adding them one by one fragments the frame.
+    columns = {'games_played': pd.Series(played, index=games.index)}
+    for stat, cast in stat_types.items():
+        total = totals[stat]
+        columns[stat] = total.round().astype('int64') if cast is int else total
+        for window in ROLLING_WINDOWS:
+            columns[f"{stat}_last{window}"] = (total - shifted[window][stat]) / np.minimum(played, window)
+    return pd.concat([games[keys + ['week']], pd.DataFrame(columns)], axis=1)
+
+def season_records(season: pd.DataFrame) -> list:
+    """
+    Converts aggregated season rows to insert records with Python values, None for missing values.
+
+    Args:
+        season (pd.DataFrame): Rows returned by aggregate_season_stats.
+
+    Returns:
+        list: One dict per row.
+    """
+    values = season.astype(object)
+    return values.where(season.notna(), None).to_dict('records')
+
+def replace_season_records(session: Session, model, seasons: Iterable[int], records: list) -> int:
+    """
+    Replaces every row of the given seasons in a season aggregate table, so a season that is
+    aggregated again (a restarted ingest or an update) never leaves stale rows behind.
+    Runs inside the session's current transaction; the caller commits.
+
+    Args:
+        session (Session): SQLAlchemy session.
+        model: The ORM model class of a table with a season column.
+        seasons (Iterable[int]): The seasons that were aggregated.
+        records (list): The seasons' new rows.
+
+    Returns:
+        int: The number of rows written.
+    """
+    table = model.__table__
+    session.execute(delete(table).where(table.c.season.in_([int(season) for season in seasons])))
+    if records:
+        session.execute(insert(table), records)
+    return len(records)
+
+def replace_weekly_records(session: Session, model, seasons: Iterable[int], records: list,
+                           watermark: Optional[Watermark] = None) -> int:
+    """
+    Replaces the rows of the given seasons in a season-to-date table, from the watermark's week
+    on. Earlier rows are kept, so an update only extends the stored prefixes with its new weeks.
+    Runs inside the session's current transaction; the caller commits.
+
+    Args:
+        session (Session): SQLAlchemy session.
+        model: The ORM model class of a table with season and week columns.
+        seasons (Iterable[int]): The seasons that were accumulated.
+        records (list): The new rows, limited to the weeks since the watermark.
+        watermark (Watermark, optional): The dataset's watermark, or None to replace the whole seasons.
+
+    Returns:
+        int: The number of rows written.
+    """
+    table = model.__table__
+    condition = table.c.season.in_([int(season) for season in seasons])
+    if watermark is not None:
+        condition = and_(condition, or_(
+            table.c.season > watermark.season,
+            and_(table.c.season == watermark.season, table.c.week >= watermark.week),
+        ))
+    session.execute(delete(table).where(condition))
+    if records:
+        session.execute(insert(table), records)
+    return len(records)
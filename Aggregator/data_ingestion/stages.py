@@ -0,0 +1,98 @@
+import os
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, NamedTuple, Optional
+
+class Stage(NamedTuple):
+    """
+    A named pipeline stage: steps that run one after another against a single database.
+    A failing step stops the rest of its stage but never another stage.
+    """
+    name: str
+    steps: List[Callable[[], None]]
+
+
+class StageResult(NamedTuple):
+    name: str
+    error: Optional[BaseException]
+    seconds: float
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def get_pipeline_workers() -> int:
+    """
+    Returns the number of stages run at the same time.
+
+    Reads the AGGREGATOR_PIPELINE_WORKERS environment variable, defaulting to 2 (the player and
+    team stages). A value of 1 runs the stages one after another.
+
+    Returns:
+        int: The number of workers.
+    """
+    return max(1, int(os.environ.get("AGGREGATOR_PIPELINE_WORKERS", 2)))
+
+def run_stage(stage: Stage) -> StageResult:
+    """
+    Runs a stage's steps in order and captures the first error instead of raising it.
+
+    Args:
+        stage (Stage): The stage to run.
+
+    Returns:
+        StageResult: The stage's outcome and duration.
+    """
+    start = time.perf_counter()
+    print(f"[DEBUG] Starting {stage.name} stage.")
+    try:
+        for step in stage.steps:
+            step()
+    except Exception as e:
+        print(f"[ERROR] {stage.name} stage failed: {e}\n{traceback.format_exc()}")
+        return StageResult(stage.name, e, time.perf_counter() - start)
+    seconds = time.perf_counter() - start
+    print(f"[DEBUG] Finished {stage.name} stage in {seconds:.1f}s.")
+    return StageResult(stage.name, None, seconds)
+
+def run_stages(stages: List[Stage], workers: Optional[int] = None) -> List[StageResult]:
+    """
+    Runs stages concurrently on a thread pool. The stages write to separate databases and share
+    the read-only DataContext, so threads are used rather than processes: each source is still
+    downloaded once, and the work is dominated by pandas and database I/O, which release the GIL.
+
+    Args:
+        stages (List[Stage]): The stages to run.
+        workers (int, optional): Maximum number of concurrent stages. Defaults to get_pipeline_workers().
+
+    Returns:
+        List[StageResult]: One result per stage, in the order given.
+    """
+    workers = min(workers or get_pipeline_workers(), len(stages)) or 1
+    if workers == 1:
+        return [run_stage(stage) for stage in stages]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="stage") as executor:
+        return list(executor.map(run_stage, stages))
+
+def report_stage_results(results: List[StageResult]) -> bool:
+    """
+    Prints a per-stage summary.
+
+    Args:
+        results (List[StageResult]): Results from run_stages.
+
+    Returns:
+        bool: True if every stage succeeded.
+    """
+    succeeded = [result for result in results if result.ok]
+    for result in results:
+        status = "succeeded" if result.ok else f"failed ({result.error})"
+        print(f"[INFO] {result.name} stage {status} after {result.seconds:.1f}s.")
+    if len(succeeded) == len(results):
+        print(f"[INFO] All {len(results)} stages succeeded.")
+    else:
+        print(f"[ERROR] {len(succeeded)}/{len(results)} stages succeeded; "
+              f"failed: {', '.join(result.name for result in results if not result.ok)}.")
+    return len(succeeded) == len(results)
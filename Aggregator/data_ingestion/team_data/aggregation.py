@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 def aggregate_offensive_stats(df: pd.DataFrame) -> pd.DataFrame:
@@ -19,24 +20,42 @@ def aggregate_offensive_stats(df: pd.DataFrame) -> pd.DataFrame:
     """
     off_cols = ['completions', 'attempts', 'passing_yards', 'passing_tds', 
                 'carries', 'rushing_yards', 'rushing_tds', 'special_teams_tds']
-    off = df.groupby(['recent_team', 'season', 'week', 'season_type', 'opponent_team'], as_index=False)[off_cols].sum()
+    off = df.groupby(['recent_team', 'season', 'week', 'season_type', 'opponent_team'], as_index=False, observed=True)[off_cols].sum()
     off = off.rename(columns={'recent_team': 'team_abbr'})
     return off
 
+DEFENSIVE_GAME_KEYS = ['opponent_team', 'season', 'week', 'season_type']
+
+# Defensive stats summed over every player the defense faced: output column -> weekly data column.
+DEFENSIVE_TOTAL_STATS = {
+    'passing_yards_allowed': 'passing_yards',
+    'rushing_yards_allowed': 'rushing_yards',
+    'carries_allowed': 'carries',
+    'sacks': 'sacks',
+    'interceptions': 'interceptions',
+}
+
+# Defensive stats summed over the players of one position: output column -> (position, weekly data column).
+# Add an entry here to track another position or stat, e.g. 'qb_rushing_yards_allowed': ('QB', 'rushing_yards').
+DEFENSIVE_POSITION_STATS = {
+    'te_yards_allowed': ('TE', 'receiving_yards'),
+    'wr_yards_allowed': ('WR', 'receiving_yards'),
+    'rb_receiving_yards_allowed': ('RB', 'receiving_yards'),
+    'te_receptions_allowed': ('TE', 'receptions'),
+    'wr_receptions_allowed': ('WR', 'receptions'),
+    'rb_receptions_allowed': ('RB', 'receptions'),
+}
+
 def aggregate_defensive_stats(df: pd.DataFrame) -> pd.DataFrame:
     """
     Aggregates defensive stats for a team using rows where the team's abbreviation appears as 
     the opponent_team (i.e. the team being defended).
     
-    Groups by:
-        opponent_team, season, week, season_type.
-    
-    Aggregated columns:
-        - For general defensive stats: we sum passing_yards, rushing_yards, sacks, and interceptions.
-          Then, we rename passing_yards -> passing_yards_allowed and rushing_yards -> rushing_yards_allowed.
-        - For receiving stats allowed, we group separately for players with positions TE, WR, and RB.
-          (We assume that when a player is on offense, his receiving yards contribute to the opponent's 
-           allowed total on defense.)
+    A single groupby over (opponent_team, season, week, season_type, position) sums every stat, which
+    is summed again per game for the totals in DEFENSIVE_TOTAL_STATS and unstacked into columns for
+    DEFENSIVE_POSITION_STATS. Float stats are summed in float64, since pandas sums float32 columns
+    in float32 and adding up per-position sums would round differently. A player's receiving
+    yards count towards the opponent's allowed totals on defense.
     
     After aggregation, we rename:
         opponent_team -> team_abbr,
@@ -48,63 +67,31 @@ def aggregate_defensive_stats(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         DataFrame: Aggregated defensive stats with columns:
                    team_abbr, season, week, season_type, opponent_team,
-                   passing_yards_allowed, rushing_yards_allowed, sacks, interceptions,
-                   te_yards_allowed, wr_yards_allowed, rb_receiving_yards_allowed.
+                   the DEFENSIVE_TOTAL_STATS columns and the DEFENSIVE_POSITION_STATS columns.
     """
-    gen = df.groupby(['opponent_team', 'season', 'week', 'season_type'], as_index=False).agg({
-        'passing_yards': 'sum',
-        'rushing_yards': 'sum',
-        'carries': 'sum',
-        'sacks': 'sum',
-        'interceptions': 'sum',
-        'recent_team': 'first'
-    })
-    gen = gen.rename(columns={
-        'opponent_team': 'team_abbr',
-        'passing_yards': 'passing_yards_allowed',
-        'rushing_yards': 'rushing_yards_allowed',
-        'recent_team': 'opponent_team',
-        'carries': 'carries_allowed'
-    })
-    
-    # Receptions allowed by defense.
-    rec_te = df[df['position'] == 'TE'].groupby(
-        ['opponent_team', 'season', 'week', 'season_type'], as_index=False
-    )['receptions'].sum().rename(columns={'opponent_team': 'team_abbr', 'receptions': 'te_receptions_allowed'})
-    
-    rec_wr = df[df['position'] == 'WR'].groupby(
-        ['opponent_team', 'season', 'week', 'season_type'], as_index=False
-    )['receptions'].sum().rename(columns={'opponent_team': 'team_abbr', 'receptions': 'wr_receptions_allowed'})
-    
-    rec_rb = df[df['position'] == 'RB'].groupby(
-        ['opponent_team', 'season', 'week', 'season_type'], as_index=False
-    )['receptions'].sum().rename(columns={'opponent_team': 'team_abbr', 'receptions': 'rb_receptions_allowed'})
-    
-    recv_te = df[df['position'] == 'TE'].groupby(
-        ['opponent_team', 'season', 'week', 'season_type'], as_index=False
-    )['receiving_yards'].sum().rename(columns={'opponent_team': 'team_abbr', 'receiving_yards': 'te_yards_allowed'})
-    
-    recv_wr = df[df['position'] == 'WR'].groupby(
-        ['opponent_team', 'season', 'week', 'season_type'], as_index=False
-    )['receiving_yards'].sum().rename(columns={'opponent_team': 'team_abbr', 'receiving_yards': 'wr_yards_allowed'})
-    
-    recv_rb = df[df['position'] == 'RB'].groupby(
-        ['opponent_team', 'season', 'week', 'season_type'], as_index=False
-    )['receiving_yards'].sum().rename(columns={'opponent_team': 'team_abbr', 'receiving_yards': 'rb_receiving_yards_allowed'})
-    
-    recv = pd.merge(recv_te, recv_wr, on=['team_abbr', 'season', 'week', 'season_type'], how='outer')
-    recv = pd.merge(recv, recv_rb, on=['team_abbr', 'season', 'week', 'season_type'], how='outer')
-    recv = recv.fillna(0)
-    
-    rec = pd.merge(rec_te, rec_wr, on=['team_abbr', 'season', 'week', 'season_type'], how='outer')
-    rec = pd.merge(rec, rec_rb, on=['team_abbr', 'season', 'week', 'season_type'], how='outer')
-    rec = rec.fillna(0)
+    stats = list(dict.fromkeys([*DEFENSIVE_TOTAL_STATS.values(),
+                                *(stat for _, stat in DEFENSIVE_POSITION_STATS.values())]))
+    # Positions are grouped by code, so players without a position (-1) still count towards the totals.
+    position_codes, positions = pd.factorize(df['position'])
+
+    by_position = (df[DEFENSIVE_GAME_KEYS + stats + ['recent_team']]
+                   .astype({stat: 'float64' for stat in stats if df[stat].dtype == 'float32'})
+                   .assign(_position=position_codes)
+                   .groupby(DEFENSIVE_GAME_KEYS + ['_position'], observed=True)
+                   .agg(**{stat: (stat, 'sum') for stat in stats}, recent_team=('recent_team', 'first')))
 
-    recv = pd.merge(recv, rec, on=['team_abbr', 'season', 'week', 'season_type'], how='outer')
+    games = by_position.groupby(level=DEFENSIVE_GAME_KEYS, observed=True)
+    totals = games[list(dict.fromkeys(DEFENSIVE_TOTAL_STATS.values()))].sum()
+    def_df = pd.DataFrame({column: totals[stat] for column, stat in DEFENSIVE_TOTAL_STATS.items()})
 
-    def_df = pd.merge(gen, recv, on=['team_abbr', 'season', 'week', 'season_type'], how='outer')
-    def_df = def_df.fillna(0)
-    return def_df
+    position_stats = by_position[stats].unstack('_position', fill_value=0)
+    position_code = {position: code for code, position in enumerate(positions)}
+    for column, (position, stat) in DEFENSIVE_POSITION_STATS.items():
+        key = (stat, position_code.get(position))
+        def_df[column] = position_stats[key].reindex(def_df.index, fill_value=0) if key in position_stats.columns else 0
+
+    def_df['_offense'] = games['recent_team'].first()
+    return def_df.reset_index().rename(columns={'opponent_team': 'team_abbr', '_offense': 'opponent_team'})
 
 def merge_team_aggregates(off_df: pd.DataFrame, def_df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -122,4 +109,154 @@ def merge_team_aggregates(off_df: pd.DataFrame, def_df: pd.DataFrame) -> pd.Data
     """
     merged = pd.merge(off_df, def_df, on=['team_abbr', 'season', 'week', 'season_type', 'opponent_team'], how='outer', suffixes=('_off', '_def'))
     merged = merged.fillna(0)
-    return merged
\ No newline at end of file
+    return merged
+
+PLAYER_GAME_KEYS = ['recent_team', 'season', 'week', 'season_type', 'opponent_team']
+PLAYER_PASSING_COLUMNS = [
+    'player_id', 'player_name', 'completions', 'attempts', 'passing_yards',
+    'passing_tds', 'interceptions', 'sacks', 'passing_air_yards',
+    'passing_yards_after_catch', 'passing_first_downs', 'passing_2pt_conversions'
+]
+PLAYER_RUSHING_COLUMNS = [
+    'player_id', 'carries', 'rushing_yards', 'rushing_tds', 'rushing_first_downs', 'rushing_2pt_conversions'
+]
+PLAYER_RECEIVING_COLUMNS = [
+    'player_id', 'receptions', 'targets', 'receiving_yards',
+    'receiving_tds', 'receiving_yards_after_catch', 'receiving_first_downs', 'receiving_2pt_conversions'
+]
+
+def group_player_game_stats(df: pd.DataFrame, mask: pd.Series, columns: list) -> dict:
+    """
+    Groups the selected player rows by game in a single pass.
+    
+    Args:
+        df (DataFrame): Raw player-level game logs.
+        mask (Series): Boolean mask selecting the players to include.
+        columns (list): Columns to keep in each player's record.
+    
+    Returns:
+        dict: (recent_team, season, week, season_type, opponent_team) -> list of player records,
+              in the order the players appear in df.
+    """
+    subset = df.loc[mask, PLAYER_GAME_KEYS + columns]
+    keys = zip(*(subset[key].tolist() for key in PLAYER_GAME_KEYS))
+    grouped = {}
+    for key, record in zip(keys, subset[columns].to_dict(orient='records')):
+        grouped.setdefault(key, []).append(record)
+    return grouped
+
+def aggregate_player_game_stats(df: pd.DataFrame) -> dict:
+    """
+    Builds the per-game player passing, rushing and receiving arrays for every team game at once.
+    
+    A player is included in:
+        - passing: if completions, attempts or passing_yards are positive.
+        - rushing: if carries are positive or rushing_yards are non-zero.
+        - receiving: if receptions or receiving_yards are positive.
+    
+    Args:
+        df (DataFrame): Raw player-level game logs.
+    
+    Returns:
+        dict: Game log column name -> {game key -> list of player records}.
+    """
+    passing = (df['completions'] > 0) | (df['attempts'] > 0) | (df['passing_yards'] > 0)
+    rushing = (df['carries'] > 0) | (df['rushing_yards'] != 0)
+    receiving = (df['receptions'] > 0) | (df['receiving_yards'] > 0)
+    return {
+        'player_passing_stats': group_player_game_stats(df, passing, PLAYER_PASSING_COLUMNS),
+        'player_recieving_stats': group_player_game_stats(df, receiving, PLAYER_RECEIVING_COLUMNS),
+        'player_rushing_stats': group_player_game_stats(df, rushing, PLAYER_RUSHING_COLUMNS),
+    }
+
+def attach_player_game_stats(team_df: pd.DataFrame, player_stats: dict) -> pd.DataFrame:
+    """
+    Joins the per-game player arrays from aggregate_player_game_stats onto team game rows.
+    Games without matching players (such as BYE weeks) get empty lists.
+    
+    Args:
+        team_df (DataFrame): Team game logs keyed by team_abbr, season, week, season_type, opponent_team.
+        player_stats (dict): Output of aggregate_player_game_stats.
+    
+    Returns:
+        DataFrame: team_df with player_passing_stats, player_recieving_stats and player_rushing_stats columns.
+    """
+    team_keys = ['team_abbr', 'season', 'week', 'season_type', 'opponent_team']
+    keys = list(zip(*(team_df[key].tolist() for key in team_keys)))
+    return team_df.assign(**{
+        column: [stats.get(key, []) for key in keys]
+        for column, stats in player_stats.items()
+    })
+
+# Offensive positions of the defense-vs-position matchups.
+MATCHUP_POSITIONS = ['QB', 'RB', 'WR', 'TE']
+
+# Matchup stats allowed to the players of a position: stat -> weekly data columns summed.
+MATCHUP_STATS = {
+    'yards_allowed': ['passing_yards', 'rushing_yards', 'receiving_yards'],
+    'receptions_allowed': ['receptions'],
+    'carries_allowed': ['carries'],
+    'tds_allowed': ['passing_tds', 'rushing_tds', 'receiving_tds'],
+}
+
+MATCHUP_SLICE_KEYS = ['season', 'season_type', 'position']
+
+def aggregate_position_matchups(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Aggregates the defense-vs-position matchups: for every defense, game and position in
+    MATCHUP_POSITIONS, the MATCHUP_STATS allowed to that position, their season-to-date
+    averages per game, and the league rank of each average.
+
+    Stats allowed are summed in one groupby over (opponent_team, season, week, season_type,
+    position), and positions a defense did not face in a game count as 0. Averages are a
+    grouped cumulative sum divided by the games played. A rank compares the defense's average
+    with the latest average of every other defense as of the same week, so teams on a bye keep
+    their place; 1 is the fewest allowed and ties share the lowest rank.
+
+    Args:
+        df (DataFrame): Raw player-level game logs covering whole seasons.
+
+    Returns:
+        DataFrame: team_abbr, season, season_type, week, position, games_played and, for every
+                   stat, the stat allowed in the game, {stat}_avg and {stat}_rank.
+    """
+    stats = list(MATCHUP_STATS)
+    values = {
+        column: pd.to_numeric(df[column], errors='coerce').fillna(0) if column in df.columns else 0.0
+        for columns in MATCHUP_STATS.values() for column in columns
+    }
+    allowed = pd.DataFrame({stat: sum(values[column] for column in columns) for stat, columns in MATCHUP_STATS.items()},
+                           index=df.index)
+    # Other positions get code -1 and are dropped when the positions are reindexed below.
+    position_codes = pd.Categorical(df['position'], categories=MATCHUP_POSITIONS).codes
+
+    by_position = (allowed.assign(**{key: df[key] for key in DEFENSIVE_GAME_KEYS}, _position=position_codes)
+                   .groupby(DEFENSIVE_GAME_KEYS + ['_position'], observed=True)[stats].sum()
+                   .unstack('_position', fill_value=0))
+    by_position = by_position.reindex(
+        columns=pd.MultiIndex.from_product([stats, range(len(MATCHUP_POSITIONS))], names=[None, '_position']),
+        fill_value=0,
+    )
+    matchups = by_position.stack('_position').reset_index()
+    matchups = matchups.assign(
+        team_abbr=matchups['opponent_team'].astype(object),
+        season_type=matchups['season_type'].astype(object),
+        position=np.array(MATCHUP_POSITIONS, dtype=object)[matchups['_position'].to_numpy()],
+    )
+    matchups = matchups[['team_abbr', 'season', 'season_type', 'week', 'position'] + stats]
+    matchups = matchups.sort_values(['season', 'season_type', 'week', 'position', 'team_abbr'], kind='stable')
+    matchups = matchups.reset_index(drop=True)
+
+    # Season-to-date averages
+    grouped = matchups.groupby(['team_abbr'] + MATCHUP_SLICE_KEYS, sort=False)
+    matchups['games_played'] = grouped.cumcount() + 1
+    averages = grouped[stats].cumsum().div(matchups['games_played'], axis=0).add_suffix('_avg')
+    matchups = matchups.join(averages)
+
+    # League ranks: every defense's latest average as of each week, carried over weeks it did not play
+    latest = matchups.set_index(MATCHUP_SLICE_KEYS + ['week', 'team_abbr'])[list(averages.columns)].unstack('team_abbr')
+    latest = latest.groupby(level=MATCHUP_SLICE_KEYS, sort=False).ffill()
+    ranks = pd.concat({column: latest[column].rank(axis=1, method='min') for column in averages.columns}, axis=1)
+    ranks = ranks.stack('team_abbr').rename(columns=lambda column: column[:-len('_avg')] + '_rank')
+    matchups = matchups.merge(ranks.reset_index(), on=MATCHUP_SLICE_KEYS + ['week', 'team_abbr'], how='left')
+    return matchups
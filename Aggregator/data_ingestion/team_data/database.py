@@ -1,7 +1,10 @@
 import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
+from typing import ContextManager
+from sqlalchemy.orm import Session
 from sqlalchemy.engine import Engine
+from ingestion_state import BaseState
+from engines import get_engine, get_session_factory, session_scope
+from json_columns import migrate_json_columns, create_indexes
 from .models import BaseTeam, TeamInfo
 
 def is_team_database_populated(session: Session) -> bool:
@@ -16,9 +19,24 @@ def is_team_database_populated(session: Session) -> bool:
     """
     return session.query(TeamInfo).first() is not None
 
+def create_team_tables(engine: Engine) -> None:
+    """
+    Creates the team_data tables that do not exist yet, converts json columns of existing
+    tables to jsonb and creates missing indexes.
+
+    Args:
+        engine: The SQLAlchemy engine instance.
+    """
+    BaseTeam.metadata.create_all(engine)
+    BaseState.metadata.create_all(engine)
+    # Databases created before the payloads were stored as JSONB are converted in place.
+    migrate_json_columns(engine)
+    create_indexes(engine, [TeamInfo.__table__])
+
 def initialize_team_database(db_url: str = None) -> Engine:
     """
-    Initializes the team_data database engine and creates all tables if not already present.
+    Returns the shared team_data database engine. The first call in a process creates the engine
+    and any missing tables; later calls reuse it and its connection pool.
     
     Args:
         db_url (str, optional): The database URL. If None, uses the TEAM_DATABASE_URL environment variable.
@@ -33,13 +51,12 @@ def initialize_team_database(db_url: str = None) -> Engine:
         db_url = os.environ.get("TEAM_DATABASE_URL")
         if not db_url:
             raise ValueError("TEAM_DATABASE_URL environment variable is not set.")
-    engine = create_engine(db_url)
-    BaseTeam.metadata.create_all(engine)
-    return engine
+    return get_engine(db_url, setup=create_team_tables)
 
 def get_team_session(engine: Engine) -> Session:
     """
     Creates and returns a new SQLAlchemy session for the team_data database.
+    The caller must close it; prefer team_session_scope, which does.
     
     Args:
         engine: The SQLAlchemy engine instance.
@@ -47,5 +64,17 @@ def get_team_session(engine: Engine) -> Session:
     Returns:
         session: A new SQLAlchemy session.
     """
-    SessionLocal = sessionmaker(bind=engine)
-    return SessionLocal()
\ No newline at end of file
+    return get_session_factory(engine)()
+
+def team_session_scope(engine: Engine) -> ContextManager[Session]:
+    """
+    Opens a session for the team_data database that is closed, and rolled back on error,
+    when the with block exits.
+
+    Args:
+        engine: The SQLAlchemy engine instance.
+
+    Returns:
+        A context manager yielding the session.
+    """
+    return session_scope(engine)
@@ -1,12 +1,23 @@
-import nfl_data_py as nfl
+from typing import Iterable, Optional
+import numpy as np
 import pandas as pd
+from sqlalchemy import SmallInteger
 from sqlalchemy.orm import Session
 from sqlalchemy.engine import Engine
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 
-from .database import get_team_session
-from .models import TeamInfo, create_team_game_log_model
-from team_data.aggregation import aggregate_offensive_stats, aggregate_defensive_stats, merge_team_aggregates
+from .database import team_session_scope
+from .models import (TeamInfo, TeamGameStats, TeamSeasonStats, TeamCumulativeStats, DefensePositionMatchup,
+                     TEAM_GAME_STAT_TYPES, create_team_game_log_model)
+from loader import BulkLoader
+from model_registry import ModelRegistry
+from season_stats import (aggregate_season_stats, accumulate_season_stats, season_records, replace_season_records,
+                          replace_weekly_records)
+from pipeline import run_pipeline, season_chunks
+from data_context import DataContext
+from ingestion_state import set_watermark, watermark_from_frame, filter_since_watermark, Watermark, TEAM_GAME_LOGS
+from team_data.aggregation import (aggregate_offensive_stats, aggregate_defensive_stats, merge_team_aggregates,
+                                   aggregate_player_game_stats, attach_player_game_stats, aggregate_position_matchups)
 
 
 def ingest_team_info(session: Session, teams_df: pd.DataFrame) -> None:
@@ -46,31 +57,48 @@ def ingest_team_info(session: Session, teams_df: pd.DataFrame) -> None:
     print(f"[DEBUG] Insert attempted for {len(records)} teams; duplicates were skipped if present.")
 
 
-def fill_missing_bye_weeks_for_team(team_df: pd.DataFrame) -> pd.DataFrame:
+def fill_missing_bye_weeks_for_team(team_df: pd.DataFrame, scheduled_weeks: dict = None,
+                                    latest_weeks: dict = None) -> pd.DataFrame:
     """
     For each (season, season_type) subset where season_type is 'REG', fill missing weeks with a 'BYE' row.
     A bye week row is created with opponent_team set to 'BYE' and all statistical columns zeroed.
+    Weeks in which the team has a scheduled game are never byes. Only weeks up to the league's
+    latest completed week (or the team's latest played week, if later) are filled, so a season
+    in progress does not get BYE rows for games that have not been played yet, but a bye is
+    written as soon as the league has played past it, even before the team's next game.
 
     Args:
         team_df (pd.DataFrame): DataFrame containing team game log data.
+        scheduled_weeks (dict, optional): season -> set of weeks the team has a scheduled game,
+            from schedule_weeks. Defaults to none.
+        latest_weeks (dict, optional): season -> the league's latest completed regular season week,
+            from schedule_weeks. Defaults to the team's latest played week.
 
     Returns:
         pd.DataFrame: Updated DataFrame with bye-week rows appended.
     """
+    scheduled_weeks = scheduled_weeks or {}
+    latest_weeks = latest_weeks or {}
     all_rows = []
-    # Group by season and season_type to fill missing weeks per season.
-    for (season_val, season_type_val), subdf in team_df.groupby(['season', 'season_type']):
+    bye_rows = []
+    # Group by season and season_type to fill missing weeks per season. Each group is numbered,
+    # so its bye rows can be put right after it once they are all built in one frame.
+    groups = team_df.groupby(['season', 'season_type'], observed=True)
+    for group, ((season_val, season_type_val), subdf) in enumerate(groups):
         if season_type_val != "REG":
-            all_rows.append(subdf)
+            all_rows.append(subdf.assign(_group=group))
             continue
 
         present_weeks = subdf['week'].unique()
-        full_weeks = range(1, 19) if season_val >= 2021 else range(1, 18)
-        missing_weeks = sorted(set(full_weeks) - set(present_weeks))
-        all_rows.append(subdf)  # Append existing rows.
+        last_week = 18 if season_val >= 2021 else 17
+        latest_week = max(present_weeks.max(), latest_weeks.get(season_val, 0))
+        full_weeks = range(1, min(last_week, latest_week) + 1)
+        missing_weeks = sorted(set(full_weeks) - set(present_weeks) - scheduled_weeks.get(season_val, set()))
+        all_rows.append(subdf.assign(_group=group))  # Append existing rows.
 
         for w in missing_weeks:
-            bye_row = {
+            bye_rows.append({
+                '_group': group,
                 'team_abbr': subdf['team_abbr'].iloc[0],
                 'season': season_val,
                 'season_type': season_type_val,
@@ -98,45 +126,177 @@ def fill_missing_bye_weeks_for_team(team_df: pd.DataFrame) -> pd.DataFrame:
                 'interceptions': 0,
                 # Special teams stats set to zero.
                 'special_teams_tds': 0
-            }
-            all_rows.append(pd.DataFrame([bye_row]))
+            })
 
-    if len(all_rows) == 1:
+    if len(all_rows) == 1 and not bye_rows:
         return team_df
-    return pd.concat(all_rows, ignore_index=True)
+    if bye_rows:
+        all_rows.append(pd.DataFrame(bye_rows))
+    filled = pd.concat(all_rows, ignore_index=True).sort_values('_group', kind='mergesort')
+    return filled.drop(columns='_group').reset_index(drop=True)
 
 
-def lookup_scores(row: pd.Series, team_abbr: str, schedules_df: pd.DataFrame) -> (object, object):
+def build_schedule_frame(schedules_df: pd.DataFrame) -> pd.DataFrame:
     """
-    Looks up the schedule row for the given game log row and returns the team and opponent scores.
+    Reshapes the schedule into one row per team per game, seen from that team's side.
+
+    Each game appears twice: once keyed by the home team and once by the away team.
+    If several schedule rows share a key, the first one in schedule order is kept.
 
     Args:
-        row (pd.Series): A row from the game logs DataFrame.
-        team_abbr (str): The team's abbreviation.
         schedules_df (pd.DataFrame): DataFrame containing schedule data.
 
     Returns:
-        tuple: (team_score, opponent_score) if found; otherwise, (None, None).
+        pd.DataFrame: Columns season, week, team_abbr, opponent_team, team_score, opponent_score.
+    """
+    columns = ['season', 'week', 'team_abbr', 'opponent_team', 'team_score', 'opponent_score']
+    home = schedules_df.rename(columns={
+        'home_team': 'team_abbr', 'away_team': 'opponent_team',
+        'home_score': 'team_score', 'away_score': 'opponent_score'
+    })[columns]
+    away = schedules_df.rename(columns={
+        'away_team': 'team_abbr', 'home_team': 'opponent_team',
+        'away_score': 'team_score', 'home_score': 'opponent_score'
+    })[columns]
+
+    position = np.arange(len(schedules_df))
+    frame = pd.concat([home.assign(_order=position), away.assign(_order=position)], ignore_index=True)
+    frame = frame.sort_values('_order', kind='mergesort')
+    frame = frame.drop_duplicates(subset=columns[:4], keep='first')
+    return frame.drop(columns='_order').reset_index(drop=True)
+
+
+def schedule_weeks(schedule_frame: pd.DataFrame) -> (dict, dict):
+    """
+    Reads the regular season weeks of every team's scheduled games and the latest completed
+    week of every season from a schedule frame, for fill_missing_bye_weeks_for_team.
+
+    Args:
+        schedule_frame (pd.DataFrame): Schedule frame from build_schedule_frame.
+
+    Returns:
+        (dict, dict): team_abbr -> {season -> set of scheduled weeks}, and season -> the latest
+                      week with a final score.
+    """
+    last_weeks = np.where(schedule_frame['season'] >= 2021, 18, 17)
+    regular = schedule_frame[schedule_frame['week'] <= last_weeks]
+    scheduled = {}
+    for (team_abbr, season), weeks in regular.groupby(['team_abbr', 'season'], sort=False)['week']:
+        scheduled.setdefault(team_abbr, {})[season] = set(weeks.tolist())
+    completed = regular[regular['team_score'].notna() & regular['opponent_score'].notna()]
+    latest = {season: int(week) for season, week in completed.groupby('season')['week'].max().items()}
+    return scheduled, latest
+
+
+def build_schedule_index(schedules_df: pd.DataFrame) -> dict:
+    """
+    Builds a hash index over the schedule for O(1) score lookups.
+
+    Args:
+        schedules_df (pd.DataFrame): DataFrame containing schedule data.
+
+    Returns:
+        dict: (season, week, team_abbr, opponent_team) -> (team_score, opponent_score).
+    """
+    return index_schedule_frame(build_schedule_frame(schedules_df))
+
+
+def index_schedule_frame(frame: pd.DataFrame) -> dict:
+    """
+    Builds the schedule index of build_schedule_index from an existing schedule frame.
+
+    Args:
+        frame (pd.DataFrame): Schedule frame from build_schedule_frame.
+
+    Returns:
+        dict: (season, week, team_abbr, opponent_team) -> (team_score, opponent_score).
+    """
+    keys = zip(frame['season'].tolist(), frame['week'].tolist(),
+               frame['team_abbr'].tolist(), frame['opponent_team'].tolist())
+    scores = zip(frame['team_score'].tolist(), frame['opponent_score'].tolist())
+    return dict(zip(keys, scores))
+
+
+def attach_scores(team_df: pd.DataFrame, schedule_index: dict) -> pd.DataFrame:
+    """
+    Attaches team_score and opponent_score to every row of a team-level game frame by
+    looking up each row's (season, week, team_abbr, opponent_team) key in the schedule index.
+    Rows without a matching game (such as BYE rows) get NaN scores. Row order is preserved.
+
+    Args:
+        team_df (pd.DataFrame): Team game logs with team_abbr, season, week and opponent_team.
+        schedule_index (dict): Schedule index from build_schedule_index.
+
+    Returns:
+        pd.DataFrame: team_df with team_score and opponent_score columns added.
+    """
+    keys = zip(team_df['season'].tolist(), team_df['week'].tolist(),
+               team_df['team_abbr'].tolist(), team_df['opponent_team'].tolist())
+    scores = pd.DataFrame([schedule_index.get(key, (None, None)) for key in keys],
+                          columns=['team_score', 'opponent_score'], index=team_df.index, dtype='float64')
+    return team_df.assign(team_score=scores['team_score'], opponent_score=scores['opponent_score'])
+
+
+def compute_game_results(team_df: pd.DataFrame, schedule_index: dict) -> list:
+    """
+    Vectorized equivalent of calling compute_game_result on every row of team_df.
+
+    Scores are attached from the schedule index, win/loss/tie flags are computed for the games
+    with known scores, and a grouped cumulative sum per (team_abbr, season) yields the
+    running record. team_df must be sorted chronologically within each team.
+
+    Args:
+        team_df (pd.DataFrame): Team game logs with team_abbr, season, week and opponent_team.
+        schedule_index (dict): Schedule index from build_schedule_index.
+
+    Returns:
+        list: The game_result payload of each row, in row order: "BYE" for bye weeks,
+              otherwise a dict with team_score, opponent_score and the cumulative record.
     """
-    sched_rows = schedules_df[
-        (schedules_df['season'] == row['season']) &
-        (schedules_df['week'] == row['week']) &
-        (
-            ((schedules_df['home_team'] == team_abbr) & (schedules_df['away_team'] == row['opponent_team'])) |
-            ((schedules_df['away_team'] == team_abbr) & (schedules_df['home_team'] == row['opponent_team']))
+    if team_df.empty:
+        return []
+
+    scored_df = attach_scores(team_df[['team_abbr', 'season', 'week', 'opponent_team']].reset_index(drop=True),
+                              schedule_index)
+    bye = (scored_df['opponent_team'] == 'BYE').to_numpy()
+    scored = (scored_df['team_score'].notna() & scored_df['opponent_score'].notna()).to_numpy() & ~bye
+    team_score = scored_df['team_score'].fillna(0).astype('int64')
+    opponent_score = scored_df['opponent_score'].fillna(0).astype('int64')
+
+    keys = [scored_df['team_abbr'], scored_df['season']]
+    wins = pd.Series(scored & (team_score > opponent_score).to_numpy()).astype('int64').groupby(keys).cumsum()
+    losses = pd.Series(scored & (team_score < opponent_score).to_numpy()).astype('int64').groupby(keys).cumsum()
+    ties = pd.Series(scored & (team_score == opponent_score).to_numpy()).astype('int64').groupby(keys).cumsum()
+    record = wins.astype(str) + '-' + losses.astype(str) + np.where(ties > 0, '-' + ties.astype(str), '')
+
+    return [
+        "BYE" if is_bye else (
+            {"team_score": ts, "opponent_score": os_, "record": rec} if is_scored
+            else {"team_score": None, "opponent_score": None, "record": None}
+        )
+        for is_bye, is_scored, ts, os_, rec in zip(
+            bye.tolist(), scored.tolist(), team_score.tolist(), opponent_score.tolist(), record.tolist()
         )
     ]
-    if sched_rows.empty:
-        return None, None
 
-    sched_row = sched_rows.iloc[0]
-    if sched_row['home_team'] == team_abbr:
-        return sched_row['home_score'], sched_row['away_score']
-    else:
-        return sched_row['away_score'], sched_row['home_score']
+
+def lookup_scores(row: pd.Series, team_abbr: str, schedule_index: dict) -> (object, object):
+    """
+    Looks up the schedule entry for the given game log row and returns the team and opponent scores.
+
+    Args:
+        row (pd.Series): A row from the game logs DataFrame.
+        team_abbr (str): The team's abbreviation.
+        schedule_index (dict): Schedule index from build_schedule_index.
+
+    Returns:
+        tuple: (team_score, opponent_score) if found; otherwise, (None, None).
+    """
+    key = (row['season'], row['week'], team_abbr, row['opponent_team'])
+    return schedule_index.get(key, (None, None))
 
 
-def compute_game_result(row: pd.Series, team_abbr: str, schedules_df: pd.DataFrame,
+def compute_game_result(row: pd.Series, team_abbr: str, schedule_index: dict,
                         current_season: int, wins: int, losses: int, ties: int) -> (object, int, int, int, int):
     """
     Computes the game result for a given team game log row. It determines the team's score, the opponent's score,
@@ -145,7 +305,7 @@ def compute_game_result(row: pd.Series, team_abbr: str, schedules_df: pd.DataFra
     Args:
         row (pd.Series): A row from the game logs DataFrame.
         team_abbr (str): The team's abbreviation.
-        schedules_df (pd.DataFrame): DataFrame containing schedule data.
+        schedule_index (dict): Schedule index from build_schedule_index.
         current_season (int): The current season being processed.
         wins (int): The cumulative wins so far.
         losses (int): The cumulative losses so far.
@@ -161,7 +321,7 @@ def compute_game_result(row: pd.Series, team_abbr: str, schedules_df: pd.DataFra
     if row['opponent_team'] == 'BYE':
         return "BYE", current_season, wins, losses, ties
 
-    team_score, opponent_score = lookup_scores(row, team_abbr, schedules_df)
+    team_score, opponent_score = lookup_scores(row, team_abbr, schedule_index)
 
     if team_score is not None and opponent_score is not None:
         # Cast scores to native Python int to ensure JSON serializability.
@@ -197,11 +357,23 @@ def compute_game_result(row: pd.Series, team_abbr: str, schedules_df: pd.DataFra
     return game_result, current_season, wins, losses, ties
 
 
-def aggregate_team_game_logs(session: Session, game_logs_df: pd.DataFrame,
-                             schedules_df: pd.DataFrame, engine: Engine) -> None:
+def prepare_team_game_logs(game_logs_df: pd.DataFrame, schedules_df: pd.DataFrame,
+                           schedule_frame: pd.DataFrame = None, schedule_index: dict = None) -> pd.DataFrame:
     """
-    Aggregates player-level game logs into team-level records, computes game results by merging schedule data,
-    and inserts the records into dynamically created game log tables.
+    Aggregates player-level game logs into team-level game rows ready to be turned into records.
+    For each team, duplicate games are dropped, missing bye weeks are filled from the schedule,
+    rows are sorted by (season, week), and the game results and per-game player stat arrays are attached.
+
+    Args:
+        game_logs_df (pd.DataFrame): Raw player-level game logs.
+        schedules_df (pd.DataFrame): DataFrame containing schedule data.
+        schedule_frame (pd.DataFrame, optional): Schedule frame from build_schedule_frame, if already built.
+            Defaults to building it from schedules_df.
+        schedule_index (dict, optional): Schedule index from build_schedule_index, if already built.
+            Defaults to indexing the schedule frame.
+
+    Returns:
+        pd.DataFrame: Team game rows grouped by team_abbr; empty if there is nothing to aggregate.
     """
     # Aggregate offensive and defensive statistics, then merge.
     off_df = aggregate_offensive_stats(game_logs_df)
@@ -209,146 +381,352 @@ def aggregate_team_game_logs(session: Session, game_logs_df: pd.DataFrame,
     merged = merge_team_aggregates(off_df, def_df)
 
     if merged.empty:
-        print("[DEBUG] No aggregated team data available.")
-        return
+        return merged
 
-    grouped = merged.groupby('team_abbr')
-    team_count = 0
-
-    for team_abbr, group in grouped:
-        team_count += 1
-        print(f"[DEBUG] Inserting team logs for {team_abbr} (team {team_count}/{len(grouped)}).")
+    if schedule_frame is None:
+        schedule_frame = build_schedule_frame(schedules_df)
+    if schedule_index is None:
+        schedule_index = index_schedule_frame(schedule_frame)
+    scheduled, latest_weeks = schedule_weeks(schedule_frame)
 
+    teams = []
+    for team_abbr, group in merged.groupby('team_abbr', observed=True):
         group = group.drop_duplicates(
             subset=['season', 'week', 'season_type', 'opponent_team'],
             keep='last'
         )
         # Fill in missing bye weeks and sort records.
-        group = fill_missing_bye_weeks_for_team(group)
-        group = group.sort_values(['season', 'week'])
-
-        # Create or get the dynamic game log model for the team and ensure the table exists.
-        GameLogModel = create_team_game_log_model(team_abbr)
-        GameLogModel.__table__.create(bind=engine, checkfirst=True)
-
-        records = []
-        current_season = None
-        wins = 0
-        losses = 0
-        ties = 0
-
-        for _, row in group.iterrows():
-            # Compute game result and update the cumulative season record.
-            game_result, current_season, wins, losses, ties = compute_game_result(
-                row, team_abbr, schedules_df, current_season, wins, losses, ties
-            )
-            record = {
-                "team_abbr": team_abbr,
-                "season": int(row['season']),
-                "week": int(row['week']),
-                "season_type": row['season_type'],
-                "opponent_team": row['opponent_team'],
-                "game_result": game_result,
-                "offensive_stats": {
-                    "completions": int(row['completions']),
-                    "attempts": int(row['attempts']),
-                    "passing_yards": float(row['passing_yards']),
-                    "passing_tds": int(row['passing_tds']),
-                    "carries": int(row['carries']),
-                    "rushing_yards": float(row['rushing_yards']),
-                    "rushing_tds": int(row['rushing_tds'])
-                },
-                "defensive_stats": {
-                    "passing_yards_allowed": float(row.get('passing_yards_allowed', 0)),
-                    "rushing_yards_allowed": float(row.get('rushing_yards_allowed', 0)),
-                    "te_yards_allowed": float(row.get('te_yards_allowed', 0)),
-                    "wr_yards_allowed": float(row.get('wr_yards_allowed', 0)),
-                    "rb_receiving_yards_allowed": float(row.get('rb_receiving_yards_allowed', 0)),
-                    "te_receptions_allowed": float(row.get('te_receptions_allowed', 0)),
-                    "wr_receptions_allowed": float(row.get('wr_receptions_allowed', 0)),
-                    "rb_receptions_allowed": float(row.get('rb_receptions_allowed', 0)),
-                    "carries_allowed": int(row.get('carries_allowed', 0)),
-                    "sacks": float(row.get('sacks', 0)),
-                    "interceptions": int(row.get('interceptions', 0))
-                },
-                "special_teams": {
-                    "special_teams_tds": int(row.get('special_teams_tds', 0))
-                },
-            }
-
-            # Filter raw player-level logs for this game.
-            mask = (
-                (game_logs_df['season'] == row['season']) &
-                (game_logs_df['week'] == row['week']) &
-                (game_logs_df['season_type'] == row['season_type']) &
-                (game_logs_df['opponent_team'] == row['opponent_team']) &
-                (game_logs_df['recent_team'] == team_abbr)
-            )
-            game_players = game_logs_df[mask]
-
-            # Extract passing stats (e.g., players with any passing contributions)
-            passing_players = game_players[
-                (game_players['completions'] > 0) |
-                (game_players['attempts'] > 0) |
-                (game_players['passing_yards'] > 0)
-            ]
-            player_passing_stats = passing_players[[
-                'player_id', 'player_name', 'completions', 'attempts', 'passing_yards',
-                'passing_tds', 'interceptions', 'sacks', 'passing_air_yards',
-                'passing_yards_after_catch', 'passing_first_downs', 'passing_2pt_conversions'
-            ]].to_dict(orient='records')
-
-            # Extract rushing stats 
-            rushing_players = game_players[
-                (game_players['carries'] > 0) |
-                (game_players['rushing_yards'] != 0)
-            ]
-            player_rushing_stats = rushing_players[[
-                'player_id', 'carries', 'rushing_yards', 'rushing_tds', 'rushing_first_downs', 'rushing_2pt_conversions'
-            ]].to_dict(orient='records')
-
-            # Extract receiving stats 
-            receiving_players = game_players[
-                (game_players['receptions'] > 0) |
-                (game_players['receiving_yards'] > 0)
-            ]
-            player_recieving_stats = receiving_players[[
-                'player_id', 'receptions', 'targets', 'receiving_yards',
-                'receiving_tds', 'receiving_yards_after_catch', 'receiving_first_downs', 'receiving_2pt_conversions'
-            ]].to_dict(orient='records')
-
-            # Add new columns to the record.
-            record["player_passing_stats"] = player_passing_stats
-            record["player_recieving_stats"] = player_recieving_stats
-            record["player_rushing_stats"] = player_rushing_stats
-
-            records.append(record)
-
-        session.bulk_insert_mappings(GameLogModel, records)
-        session.commit()
-
-    print(f"[DEBUG] Aggregated and ingested {len(merged)} team game log records in bulk.")
-
-
-def ingest_team_data(years: list = [2022, 2023, 2024], engine: Engine = None) -> None:
+        group = fill_missing_bye_weeks_for_team(group, scheduled.get(team_abbr), latest_weeks)
+        teams.append(group.sort_values(['season', 'week']))
+    prepared = pd.concat(teams, ignore_index=True)
+
+    # Compute game results and cumulative season records, then attach player stat arrays.
+    prepared = prepared.assign(game_result=compute_game_results(prepared, schedule_index))
+    return attach_player_game_stats(prepared, aggregate_player_game_stats(game_logs_df))
+
+
+def create_team_records(team_abbr: str, team_df: pd.DataFrame) -> list:
+    """
+    Creates the game log records (dictionaries) of one team from rows prepared by prepare_team_game_logs.
+
+    Args:
+        team_abbr (str): The team's abbreviation.
+        team_df (pd.DataFrame): The team's prepared game rows.
+
+    Returns:
+        list: Records suitable for insertion into the team's game log table.
+    """
+    records = []
+    for _, row in team_df.iterrows():
+        records.append({
+            "team_abbr": team_abbr,
+            "season": int(row['season']),
+            "week": int(row['week']),
+            "season_type": row['season_type'],
+            "opponent_team": row['opponent_team'],
+            "game_result": row['game_result'],
+            "offensive_stats": {
+                "completions": int(row['completions']),
+                "attempts": int(row['attempts']),
+                "passing_yards": float(row['passing_yards']),
+                "passing_tds": int(row['passing_tds']),
+                "carries": int(row['carries']),
+                "rushing_yards": float(row['rushing_yards']),
+                "rushing_tds": int(row['rushing_tds'])
+            },
+            "defensive_stats": {
+                "passing_yards_allowed": float(row.get('passing_yards_allowed', 0)),
+                "rushing_yards_allowed": float(row.get('rushing_yards_allowed', 0)),
+                "te_yards_allowed": float(row.get('te_yards_allowed', 0)),
+                "wr_yards_allowed": float(row.get('wr_yards_allowed', 0)),
+                "rb_receiving_yards_allowed": float(row.get('rb_receiving_yards_allowed', 0)),
+                "te_receptions_allowed": float(row.get('te_receptions_allowed', 0)),
+                "wr_receptions_allowed": float(row.get('wr_receptions_allowed', 0)),
+                "rb_receptions_allowed": float(row.get('rb_receptions_allowed', 0)),
+                "carries_allowed": int(row.get('carries_allowed', 0)),
+                "sacks": float(row.get('sacks', 0)),
+                "interceptions": int(row.get('interceptions', 0))
+            },
+            "special_teams": {
+                "special_teams_tds": int(row.get('special_teams_tds', 0))
+            },
+            "player_passing_stats": row['player_passing_stats'],
+            "player_recieving_stats": row['player_recieving_stats'],
+            "player_rushing_stats": row['player_rushing_stats'],
+        })
+    return records
+
+
+TEAM_GAME_KEYS = ['team_abbr', 'season', 'week', 'season_type', 'opponent_team']
+GAME_RESULT_COLUMNS = ['team_score', 'opponent_score', 'record']
+
+def create_team_stat_records(prepared: pd.DataFrame) -> list:
+    """
+    Creates the team_game_stats records of every team from rows prepared by prepare_team_game_logs:
+    the same games and numbers as create_team_records, one typed column per stat.
+
+    Args:
+        prepared (pd.DataFrame): Prepared team game rows.
+
+    Returns:
+        list: Records suitable for insertion into the team_game_stats table.
+    """
+    if prepared.empty:
+        return []
+    columns = {
+        'team_abbr': prepared['team_abbr'].tolist(),
+        'season': prepared['season'].astype('int64').tolist(),
+        'week': prepared['week'].astype('int64').tolist(),
+        'season_type': prepared['season_type'].tolist(),
+        'opponent_team': prepared['opponent_team'].tolist(),
+    }
+    # Bye weeks have the game_result "BYE" and no scores.
+    results = [result if isinstance(result, dict) else {} for result in prepared['game_result'].tolist()]
+    for name in GAME_RESULT_COLUMNS:
+        columns[name] = [result.get(name) for result in results]
+
+    for column in TeamGameStats.__table__.columns:
+        if column.name in columns:
+            continue
+        values = prepared[column.name].fillna(0) if column.name in prepared.columns else pd.Series(0, index=prepared.index)
+        if isinstance(column.type, SmallInteger):
+            columns[column.name] = values.astype('float64').round().astype('int64').tolist()
+        else:
+            columns[column.name] = values.astype('float64').tolist()
+    return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+
+TEAM_SEASON_KEYS = ['team_abbr', 'season', 'season_type']
+
+def team_games(stat_records: list) -> pd.DataFrame:
+    """
+    Returns the games a team played from team_game_stats records, bye weeks excluded.
+
+    Args:
+        stat_records (list): team_game_stats records, from create_team_stat_records.
+
+    Returns:
+        pd.DataFrame: One row per game.
+    """
+    games = pd.DataFrame(stat_records)
+    return games[games['opponent_team'] != 'BYE']
+
+def aggregate_team_season_stats(stat_records: list) -> list:
+    """
+    Aggregates team_game_stats records into team_season_stats records. Bye weeks are not
+    counted as games; wins, losses, ties and points only count games with known scores.
+
+    Args:
+        stat_records (list): team_game_stats records covering whole seasons, from create_team_stat_records.
+
+    Returns:
+        list: One record per (team_abbr, season, season_type).
+    """
+    if not stat_records:
+        return []
+    games = team_games(stat_records)
+    team_score = games['team_score'].astype('float64')
+    opponent_score = games['opponent_score'].astype('float64')
+    games = games[TEAM_SEASON_KEYS + list(TEAM_GAME_STAT_TYPES)].assign(
+        wins=(team_score > opponent_score).astype('int64'),
+        losses=(team_score < opponent_score).astype('int64'),
+        ties=(team_score == opponent_score).astype('int64'),
+        points_for=team_score.fillna(0).astype('int64'),
+        points_against=opponent_score.fillna(0).astype('int64'),
+    )
+
+    season = aggregate_season_stats(games, TEAM_SEASON_KEYS, TEAM_GAME_STAT_TYPES)
+    results = games.groupby(TEAM_SEASON_KEYS, sort=False)[
+        ['wins', 'losses', 'ties', 'points_for', 'points_against']
+    ].sum()
+    season = season.merge(results.reset_index(), on=TEAM_SEASON_KEYS, how='left')
+    return season_records(season)
+
+def accumulate_team_stats(stat_records: list, watermark: Optional[Watermark] = None) -> list:
+    """
+    Computes team_cumulative_stats records from team_game_stats records.
+
+    Args:
+        stat_records (list): team_game_stats records covering whole seasons, from create_team_stat_records.
+        watermark (Watermark, optional): Only rows since the watermark are returned. Defaults to every row.
+
+    Returns:
+        list: One record per game played.
+    """
+    if not stat_records:
+        return []
+    accumulated = accumulate_season_stats(team_games(stat_records), TEAM_SEASON_KEYS, TEAM_GAME_STAT_TYPES)
+    return season_records(filter_since_watermark(accumulated, watermark))
+
+
+def create_matchup_records(game_logs_df: pd.DataFrame, watermark: Optional[Watermark] = None) -> list:
+    """
+    Creates the defense_position_matchups records from player-level game logs.
+
+    Args:
+        game_logs_df (pd.DataFrame): Raw player-level game logs covering whole seasons.
+        watermark (Watermark, optional): Only rows since the watermark are returned. Defaults to every row.
+
+    Returns:
+        list: One record per defense, game and position.
+    """
+    if game_logs_df.empty:
+        return []
+    matchups = filter_since_watermark(aggregate_position_matchups(game_logs_df), watermark)
+    for column in DefensePositionMatchup.__table__.columns:
+        if isinstance(column.type, SmallInteger) and not column.primary_key:
+            matchups[column.name] = matchups[column.name].round().astype('Int64')
+    return season_records(matchups)
+
+
+# Team game log models declared so far, and the tables known to exist in each database.
+GAME_LOG_MODELS = ModelRegistry(create_team_game_log_model)
+
+def get_team_game_log_model(team_abbr: str, engine: Engine):
+    """
+    Returns the ORM model for a team's game log table, creating the table if needed.
+
+    Args:
+        team_abbr (str): The team's abbreviation.
+        engine (Engine): SQLAlchemy engine for the team_data database.
+
+    Returns:
+        The ORM model class for the team's game logs.
+    """
+    return GAME_LOG_MODELS.get(team_abbr, engine)
+
+
+def create_team_game_log_tables(team_abbrs: Iterable[str], engine: Engine) -> None:
+    """
+    Creates the missing {team_abbr}_game_logs tables of several teams in one transaction.
+
+    Args:
+        team_abbrs (Iterable[str]): The teams about to be written.
+        engine (Engine): SQLAlchemy engine for the team_data database.
+    """
+    GAME_LOG_MODELS.ensure_tables(engine, team_abbrs)
+
+
+def build_team_game_log_records(prepared: pd.DataFrame) -> list:
+    """
+    Builds the game log records of every team from rows prepared by prepare_team_game_logs.
+
+    Args:
+        prepared (pd.DataFrame): Prepared team game rows.
+
+    Returns:
+        list: (team_abbr, records) pairs, in the order teams first appear.
+    """
+    if prepared.empty:
+        return []
+    grouped = prepared.groupby('team_abbr', sort=False, observed=True)
+    team_records = []
+    for team_count, (team_abbr, group) in enumerate(grouped, start=1):
+        print(f"[DEBUG] Preparing team logs for {team_abbr} (team {team_count}/{len(grouped)}).")
+        team_records.append((team_abbr, create_team_records(team_abbr, group)))
+    return team_records
+
+
+def write_team_game_logs(session: Session, engine: Engine, team_records: list, stat_records: list = None) -> int:
+    """
+    Writes team game log records in large batches, creating the missing team tables first.
+
+    Args:
+        session (Session): SQLAlchemy session for the team_data database.
+        engine (Engine): SQLAlchemy engine for the team_data database.
+        team_records (list): (team_abbr, records) pairs from build_team_game_log_records.
+        stat_records (list, optional): team_game_stats records from create_team_stat_records.
+
+    Returns:
+        int: The number of game log records loaded.
+    """
+    create_team_game_log_tables((team_abbr for team_abbr, _ in team_records), engine)
+    with BulkLoader(session) as loader:
+        for team_abbr, records in team_records:
+            # The team's table was created above.
+            loader.add(get_team_game_log_model(team_abbr, engine), records)
+        loader.add(TeamGameStats, stat_records)
+    return sum(len(records) for _, records in team_records)
+
+
+def aggregate_team_game_logs(session: Session, game_logs_df: pd.DataFrame,
+                             schedules_df: pd.DataFrame, engine: Engine,
+                             schedule_frame: pd.DataFrame = None, schedule_index: dict = None) -> None:
+    """
+    Aggregates player-level game logs into team-level records, computes game results by merging schedule data,
+    and inserts the records into dynamically created game log tables and the typed team_game_stats table.
+    The team_season_stats, team_cumulative_stats and defense_position_matchups rows of the
+    aggregated seasons are replaced.
+    """
+    prepared = prepare_team_game_logs(game_logs_df, schedules_df, schedule_frame, schedule_index)
+
+    if prepared.empty:
+        print("[DEBUG] No aggregated team data available.")
+        return
+
+    stat_records = create_team_stat_records(prepared)
+    loaded = write_team_game_logs(session, engine, build_team_game_log_records(prepared), stat_records)
+    seasons = prepared['season'].unique()
+    replace_season_records(session, TeamSeasonStats, seasons, aggregate_team_season_stats(stat_records))
+    replace_weekly_records(session, TeamCumulativeStats, seasons, accumulate_team_stats(stat_records))
+    replace_weekly_records(session, DefensePositionMatchup, seasons, create_matchup_records(game_logs_df))
+    session.commit()
+    print(f"[DEBUG] Aggregated and ingested {loaded} team game log records in bulk.")
+
+
+def ingest_team_data(years: list = [2022, 2023, 2024], engine: Engine = None,
+                     context: DataContext = None) -> None:
     """
     Main function to ingest team data using nfl-data-py. This function imports team descriptions,
     game logs, and schedules, then processes and ingests the data into the team_data database.
 
+    Game logs are ingested one chunk of seasons at a time (see season_chunks) through a pipeline:
+    the next chunk is fetched while the current one is aggregated and the previous one is written,
+    and the watermark advances after each chunk. Seasons are independent, since records reset
+    every season, so the result matches ingesting every season at once. Each chunk's
+    team_season_stats, team_cumulative_stats and defense_position_matchups rows are written
+    with its game logs.
+
     Args:
         years (list, optional): List of seasons for which to ingest data. Defaults to [2022, 2023, 2024].
         engine (Engine, optional): SQLAlchemy engine for database operations. Defaults to None.
+        context (DataContext, optional): Shared data context covering years, or a
+            SharedSeasonContexts view whose chunk contexts are shared with another stage.
+            Defaults to fetching each season separately.
     """
     print("[DEBUG] Importing team descriptions...")
-    teams_df = nfl.import_team_desc()
-
-    print("[DEBUG] Importing team game logs data...")
-    game_logs_df = nfl.import_weekly_data(years)
-
-    print("[DEBUG] Importing game schedules...")
-    schedules_df = nfl.import_schedules(years)
-
-    session = get_team_session(engine)
+    teams_df = (context or DataContext(years)).team_desc
 
     # ingest_team_info(session, teams_df)
-    aggregate_team_game_logs(session, game_logs_df, schedules_df, engine)
\ No newline at end of file
+
+    def fetch(seasons):
+        print(f"[DEBUG] Importing team game logs and schedules for seasons {seasons}...")
+        season_context = context.subset(seasons) if context is not None else DataContext(seasons)
+        return (season_context.weekly_data, season_context.schedules, season_context.schedule_frame,
+                season_context.schedule_index)
+
+    def transform(seasons, data):
+        game_logs_df, schedules_df, schedule_frame, schedule_index = data
+        if game_logs_df.empty:
+            return None, [], [], [], [], []
+        prepared = prepare_team_game_logs(game_logs_df, schedules_df, schedule_frame, schedule_index)
+        stat_records = create_team_stat_records(prepared)
+        return (watermark_from_frame(game_logs_df), build_team_game_log_records(prepared), stat_records,
+                aggregate_team_season_stats(stat_records), accumulate_team_stats(stat_records),
+                create_matchup_records(game_logs_df))
+
+    def write(seasons, result):
+        watermark, team_records, stat_records, season_stats, cumulative_stats, matchups = result
+        # Each chunk gets its own session, so the connection goes back to the pool between chunks.
+        with team_session_scope(engine) as session:
+            loaded = write_team_game_logs(session, engine, team_records, stat_records)
+            replace_season_records(session, TeamSeasonStats, seasons, season_stats)
+            replace_weekly_records(session, TeamCumulativeStats, seasons, cumulative_stats)
+            replace_weekly_records(session, DefensePositionMatchup, seasons, matchups)
+            # Commit the aggregates here: set_watermark does not commit when the watermark is unchanged.
+            session.commit()
+            # Record what was loaded so later updates (or a restarted ingest) start from here.
+            set_watermark(session, TEAM_GAME_LOGS, watermark)
+        print(f"[DEBUG] Aggregated and ingested {loaded} team game log records for seasons {seasons}.")
+
+    run_pipeline(season_chunks(years), fetch, transform, write)
@@ -1,5 +1,7 @@
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy import Column, String, Integer, JSON, ForeignKey
+from sqlalchemy import Column, String, Integer, SmallInteger, REAL, ForeignKey, Index
+from json_columns import JSONType
+from season_stats import season_stat_columns, cumulative_stat_columns
 
 BaseTeam = declarative_base()
 
@@ -7,16 +9,164 @@ class TeamInfo(BaseTeam):
     """
     ORM model for the team_info table.
     
-    Stores basic team information as a JSON object.
+    Stores basic team information as a JSON object (JSONB on PostgreSQL).
     """
     __tablename__ = 'team_info'
     
     team_abbr = Column(String(3), primary_key=True)
-    team_data = Column(JSON, nullable=False)
+    team_data = Column(JSONType, nullable=False)
     
     def __repr__(self) -> str:
         return f"<TeamInfo(team_abbr={self.team_abbr})>"
 
+class TeamGameStats(BaseTeam):
+    """
+    ORM model for the team_game_stats table.
+
+    Typed counterpart of the {team_abbr}_game_logs tables: one row per team game, for every team,
+    with one numeric column per team stat instead of the game_result, offensive_stats,
+    defensive_stats and special_teams JSON payloads. Stats can be summed, filtered and indexed
+    directly. Bye weeks have opponent_team 'BYE', zero stats and no scores.
+    """
+    __tablename__ = 'team_game_stats'
+
+    team_abbr = Column(String(3), primary_key=True)
+    season = Column(Integer, primary_key=True)
+    week = Column(SmallInteger, primary_key=True)
+    season_type = Column(String(10), primary_key=True)
+    opponent_team = Column(String(3), primary_key=True)
+
+    # Game result.
+    team_score = Column(SmallInteger, nullable=True)
+    opponent_score = Column(SmallInteger, nullable=True)
+    record = Column(String(12), nullable=True)
+
+    # Offense.
+    completions = Column(SmallInteger, nullable=False, default=0)
+    attempts = Column(SmallInteger, nullable=False, default=0)
+    passing_yards = Column(REAL, nullable=False, default=0)
+    passing_tds = Column(SmallInteger, nullable=False, default=0)
+    carries = Column(SmallInteger, nullable=False, default=0)
+    rushing_yards = Column(REAL, nullable=False, default=0)
+    rushing_tds = Column(SmallInteger, nullable=False, default=0)
+
+    # Defense.
+    passing_yards_allowed = Column(REAL, nullable=False, default=0)
+    rushing_yards_allowed = Column(REAL, nullable=False, default=0)
+    te_yards_allowed = Column(REAL, nullable=False, default=0)
+    wr_yards_allowed = Column(REAL, nullable=False, default=0)
+    rb_receiving_yards_allowed = Column(REAL, nullable=False, default=0)
+    te_receptions_allowed = Column(SmallInteger, nullable=False, default=0)
+    wr_receptions_allowed = Column(SmallInteger, nullable=False, default=0)
+    rb_receptions_allowed = Column(SmallInteger, nullable=False, default=0)
+    carries_allowed = Column(SmallInteger, nullable=False, default=0)
+    sacks = Column(REAL, nullable=False, default=0)
+    interceptions = Column(SmallInteger, nullable=False, default=0)
+
+    # Special teams.
+    special_teams_tds = Column(SmallInteger, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<TeamGameStats(team_abbr={self.team_abbr}, season={self.season}, week={self.week})>"
+
+class DefensePositionMatchup(BaseTeam):
+    """
+    ORM model for the defense_position_matchups table.
+
+    One row per defense, game and offensive position (QB, RB, WR, TE) with what the defense
+    allowed to that position in the game, its season-to-date average per game, and the league
+    rank of that average as of the week (1 = fewest allowed). Looking up a week's ranking of
+    every defense for a position uses the season/week/position index.
+    """
+    __tablename__ = 'defense_position_matchups'
+    __table_args__ = (
+        Index('ix_defense_position_matchups_week', 'season', 'season_type', 'week', 'position'),
+    )
+
+    team_abbr = Column(String(3), primary_key=True)
+    season = Column(Integer, primary_key=True)
+    season_type = Column(String(10), primary_key=True)
+    week = Column(SmallInteger, primary_key=True)
+    position = Column(String(3), primary_key=True)
+    games_played = Column(SmallInteger, nullable=False, default=0)
+
+    # Allowed in the game.
+    yards_allowed = Column(REAL, nullable=False, default=0)
+    receptions_allowed = Column(SmallInteger, nullable=False, default=0)
+    carries_allowed = Column(SmallInteger, nullable=False, default=0)
+    tds_allowed = Column(SmallInteger, nullable=False, default=0)
+
+    # Season-to-date averages per game.
+    yards_allowed_avg = Column(REAL, nullable=False, default=0)
+    receptions_allowed_avg = Column(REAL, nullable=False, default=0)
+    carries_allowed_avg = Column(REAL, nullable=False, default=0)
+    tds_allowed_avg = Column(REAL, nullable=False, default=0)
+
+    # League ranks of the averages.
+    yards_allowed_rank = Column(SmallInteger, nullable=True)
+    receptions_allowed_rank = Column(SmallInteger, nullable=True)
+    carries_allowed_rank = Column(SmallInteger, nullable=True)
+    tds_allowed_rank = Column(SmallInteger, nullable=True)
+
+    def __repr__(self) -> str:
+        return (f"<DefensePositionMatchup(team_abbr={self.team_abbr}, season={self.season}, "
+                f"week={self.week}, position={self.position})>")
+
+# team_game_stats stat column -> int or float.
+TEAM_GAME_STAT_TYPES = {
+    column.name: int if isinstance(column.type, SmallInteger) else float
+    for column in TeamGameStats.__table__.columns
+    if not column.primary_key and column.name not in ('team_score', 'opponent_score', 'record')
+}
+
+class TeamSeasonStats(BaseTeam):
+    """
+    ORM model for the team_season_stats table.
+
+    One row per (team_abbr, season, season_type) with the team's games played (bye weeks
+    excluded), win-loss-tie record, points for and against and, for every team_game_stats stat,
+    its season total and per-game average. Rows are replaced whenever their season is ingested
+    or updated.
+    """
+    __tablename__ = 'team_season_stats'
+
+    team_abbr = Column(String(3), primary_key=True)
+    season = Column(Integer, primary_key=True)
+    season_type = Column(String(10), primary_key=True)
+    wins = Column(SmallInteger, nullable=False, default=0)
+    losses = Column(SmallInteger, nullable=False, default=0)
+    ties = Column(SmallInteger, nullable=False, default=0)
+    points_for = Column(Integer, nullable=False, default=0)
+    points_against = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<TeamSeasonStats(team_abbr={self.team_abbr}, season={self.season})>"
+
+class TeamCumulativeStats(BaseTeam):
+    """
+    ORM model for the team_cumulative_stats table.
+
+    One row per game a team played (bye weeks excluded), keyed by (team_abbr, season,
+    season_type, week), with the games played and every team_game_stats stat's total through
+    that week (season to date), plus its average over the team's last 3 and last 5 games of
+    the season. The total of a week range is the difference of two rows.
+    """
+    __tablename__ = 'team_cumulative_stats'
+
+    team_abbr = Column(String(3), primary_key=True)
+    season = Column(Integer, primary_key=True)
+    season_type = Column(String(10), primary_key=True)
+    week = Column(SmallInteger, primary_key=True)
+
+    def __repr__(self) -> str:
+        return f"<TeamCumulativeStats(team_abbr={self.team_abbr}, season={self.season}, week={self.week})>"
+
+# The stat columns follow team_game_stats, so they are added to the declared models in a loop.
+for stat_column, column in season_stat_columns(TEAM_GAME_STAT_TYPES).items():
+    setattr(TeamSeasonStats, stat_column, column)
+for stat_column, column in cumulative_stat_columns(TEAM_GAME_STAT_TYPES).items():
+    setattr(TeamCumulativeStats, stat_column, column)
+
 def create_team_game_log_model(team_abbr: str):
     """
     Dynamically creates an ORM model class for a team's game log table.
@@ -43,13 +193,13 @@ def create_team_game_log_model(team_abbr: str):
         'week': Column(Integer, primary_key=True),
         'season_type': Column(String(10), primary_key=True),
         'opponent_team': Column(String(3), primary_key=True),
-        'game_result' : Column(JSON, nullable=True),
-        'offensive_stats': Column(JSON, nullable=True),
-        'defensive_stats': Column(JSON, nullable=True),
-        'special_teams': Column(JSON, nullable=True),
-        'player_passing_stats': Column(JSON, nullable=True),
-        'player_recieving_stats': Column(JSON, nullable=True),
-        'player_rushing_stats': Column(JSON, nullable=True),
+        'game_result' : Column(JSONType, nullable=True),
+        'offensive_stats': Column(JSONType, nullable=True),
+        'defensive_stats': Column(JSONType, nullable=True),
+        'special_teams': Column(JSONType, nullable=True),
+        'player_passing_stats': Column(JSONType, nullable=True),
+        'player_recieving_stats': Column(JSONType, nullable=True),
+        'player_rushing_stats': Column(JSONType, nullable=True),
         '__repr__': lambda self: f"<TeamGameLog(team_abbr={self.team_abbr}, season={self.season}, week={self.week})>",
     }
     
@@ -1,108 +1,79 @@
 import pandas as pd
-import nfl_data_py as nfl
 from sqlalchemy.orm import Session
 from sqlalchemy.engine import Engine
 
-from .database import get_team_session
-from .models import TeamInfo, create_team_game_log_model
-from team_data.aggregation import aggregate_offensive_stats, aggregate_defensive_stats, merge_team_aggregates
-from team_data.ingestion import fill_missing_bye_weeks_for_team, compute_game_result
+from .database import team_session_scope
+from .models import TeamInfo, TeamGameStats, TeamSeasonStats, TeamCumulativeStats, DefensePositionMatchup
+from team_data.ingestion import (prepare_team_game_logs, create_team_records, get_team_game_log_model,
+                                 create_team_game_log_tables, create_team_stat_records, aggregate_team_season_stats,
+                                 accumulate_team_stats, create_matchup_records)
+from loader import insert_missing_records
+from season_stats import replace_season_records, replace_weekly_records
+from data_context import DataContext, select_seasons
+from ingestion_state import (get_watermark, set_watermark, watermark_from_frame, seasons_to_update,
+                             filter_since_watermark, TEAM_GAME_LOGS, DEFAULT_UPDATE_START_SEASON)
 
-def update_team_game_logs(engine: Engine, years: list):
+def update_team_game_logs(engine: Engine, years: list = None, context: DataContext = None):
     """
-    Update team game logs by comparing new aggregated data from nfl-data-py with existing records.
-    For each team, missing game logs are inserted.
-    
+    Update team game logs, and the typed team_game_stats table, with new aggregated data from nfl-data-py.
+    Only the seasons since the team game logs watermark are fetched and only games since the
+    watermark are written. Rows are sent to the database with INSERT ... ON CONFLICT DO NOTHING,
+    so existing rows are never read back. The team_season_stats rows of the seasons with games
+    since the watermark are recomputed from the fetched seasons and replaced, and their
+    team_cumulative_stats and defense_position_matchups rows are recomputed for the weeks since
+    the watermark only.
+
     Args:
         engine (Engine): SQLAlchemy engine for the team_data database.
-        years (list): List of seasons to update.
+        years (list, optional): Seasons to fetch. Defaults to the seasons since the watermark.
+        context (DataContext, optional): Shared data context covering years. Defaults to a new context.
     """
     print("[DEBUG] Updating team game logs...")
-    new_game_logs_df = nfl.import_weekly_data(years)
-    schedules_df = nfl.import_schedules(years)
-    
-    # Aggregate offensive and defensive stats and merge into a single DataFrame
-    off_df = aggregate_offensive_stats(new_game_logs_df)
-    def_df = aggregate_defensive_stats(new_game_logs_df)
-    merged = merge_team_aggregates(off_df, def_df)
-    
-    if merged.empty:
-        print("[DEBUG] No new team game log data available.")
-        return
-    
-    # Remove duplicates and fill in bye weeks as in ingestion
-    merged = merged.drop_duplicates(
-        subset=['season', 'week', 'season_type', 'opponent_team'], keep='last'
-    )
-    merged = fill_missing_bye_weeks_for_team(merged)
-    merged = merged.sort_values(['season', 'week'])
-    
-    session = get_team_session(engine)
-    teams = merged['team_abbr'].unique()
-    print(f"[DEBUG] Found {len(teams)} teams to update.")
-    
-    for team_abbr in teams:
-        team_group = merged[merged['team_abbr'] == team_abbr]
-        
-        # Dynamically create the model for the team's game log table and ensure the table exists
-        GameLogModel = create_team_game_log_model(team_abbr)
-        GameLogModel.__table__.create(bind=engine, checkfirst=True)
-        
-        # Query existing game logs for this team
-        existing_logs = session.query(GameLogModel).all()
-        existing_keys = {(log.season, log.week, log.season_type, log.opponent_team) for log in existing_logs}
-        
-        new_records = []
-        current_season = None
-        wins = 0
-        losses = 0
-        ties = 0
+    with team_session_scope(engine) as session:
+        watermark = get_watermark(session, TEAM_GAME_LOGS)
+        years = years or seasons_to_update(watermark, DEFAULT_UPDATE_START_SEASON)
+        print(f"[DEBUG] Fetching team game logs for seasons {years} (watermark: {watermark}).")
+
+        context = context or DataContext(years)
+        new_game_logs_df = select_seasons(context.weekly_data, years)
+        schedules_df = select_seasons(context.schedules, years)
+
+        # Aggregate, fill bye weeks and compute game results exactly as in ingestion. Results are
+        # computed over every fetched game so season records also count games already stored.
+        season_prepared = prepare_team_game_logs(new_game_logs_df, schedules_df, context.schedule_frame,
+                                                 context.schedule_index)
+        prepared = filter_since_watermark(season_prepared, watermark)
+
+        if prepared.empty:
+            print("[DEBUG] No new team game log data available.")
+            return
+
+        grouped = prepared.groupby('team_abbr', sort=False, observed=True)
+        print(f"[DEBUG] Found {len(grouped)} teams to update.")
         count = 0
-        for _, row in team_group.iterrows():
-            key = (int(row['season']), int(row['week']), row['season_type'], row['opponent_team'])
-            if key not in existing_keys:
-                # Compute the game result (win/loss/tie) using schedule data
-                game_result, current_season, wins, losses, ties = compute_game_result(
-                    row, team_abbr, schedules_df, current_season, wins, losses, ties
-                )
-                record = {
-                    "team_abbr": team_abbr,
-                    "season": int(row['season']),
-                    "week": int(row['week']),
-                    "season_type": row['season_type'],
-                    "opponent_team": row['opponent_team'],
-                    "game_result": game_result,
-                    "offensive_stats": {
-                        "completions": int(row['completions']),
-                        "attempts": int(row['attempts']),
-                        "passing_yards": float(row['passing_yards']),
-                        "passing_tds": int(row['passing_tds']),
-                        "carries": int(row['carries']),
-                        "rushing_yards": float(row['rushing_yards']),
-                        "rushing_tds": int(row['rushing_tds'])
-                    },
-                    "defensive_stats": {
-                        "passing_yards_allowed": float(row.get('passing_yards_allowed', 0)),
-                        "rushing_yards_allowed": float(row.get('rushing_yards_allowed', 0)),
-                        "te_yards_allowed": float(row.get('te_yards_allowed', 0)),
-                        "wr_yards_allowed": float(row.get('wr_yards_allowed', 0)),
-                        "rb_receiving_yards_allowed": float(row.get('rb_receiving_yards_allowed', 0)),
-                        "te_receptions_allowed": float(row.get('te_receptions_allowed', 0)),
-                        "wr_receptions_allowed": float(row.get('wr_receptions_allowed', 0)),
-                        "rb_receptions_allowed": float(row.get('rb_receptions_allowed', 0)),
-                        "carries_allowed": int(row.get('carries_allowed', 0)),
-                        "sacks": float(row.get('sacks', 0)),
-                        "interceptions": int(row.get('interceptions', 0))
-                    },
-                    "special_teams": {
-                        "special_teams_tds": int(row.get('special_teams_tds', 0))
-                    },
-                }
-                new_records.append(record)
-        
-        if new_records:
-            count += 1
-            print(f"[DEBUG] Inserting {len(new_records)} new game log(s) for team {team_abbr}.")
-            session.bulk_insert_mappings(GameLogModel, new_records)
-            session.commit()
-    print(f"[DEBUG] Team game logs update complete, updated {count} teams.")
\ No newline at end of file
+        create_team_game_log_tables(grouped.groups.keys(), engine)
+
+        for team_abbr, team_group in grouped:
+            # Resolve the model for the team's game log table, created above
+            GameLogModel = get_team_game_log_model(team_abbr, engine)
+
+            inserted = insert_missing_records(session, GameLogModel, create_team_records(team_abbr, team_group))
+            if inserted:
+                count += 1
+                print(f"[DEBUG] Inserted {inserted} new game log(s) for team {team_abbr}.")
+        insert_missing_records(session, TeamGameStats, create_team_stat_records(prepared))
+
+        # Re-aggregate only the seasons that have games since the watermark, and extend their
+        # season-to-date rows from the watermark's week on
+        changed_seasons = prepared['season'].unique()
+        changed_df = new_game_logs_df[new_game_logs_df['season'].isin(changed_seasons)]
+        season_stat_records = create_team_stat_records(season_prepared[season_prepared['season'].isin(changed_seasons)])
+        replace_season_records(session, TeamSeasonStats, changed_seasons, aggregate_team_season_stats(season_stat_records))
+        replace_weekly_records(session, TeamCumulativeStats, changed_seasons,
+                               accumulate_team_stats(season_stat_records, watermark), watermark)
+        # Matchup averages and ranks only change from the watermark's week on
+        replace_weekly_records(session, DefensePositionMatchup, changed_seasons,
+                               create_matchup_records(changed_df, watermark), watermark)
+        session.commit()
+        set_watermark(session, TEAM_GAME_LOGS, watermark_from_frame(new_game_logs_df))
+    print(f"[DEBUG] Team game logs update complete, updated {count} teams.")
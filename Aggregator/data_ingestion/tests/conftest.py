@@ -0,0 +1,97 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# The ingestion modules import each other as top-level modules, as when main.py is run directly.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from schema import WEEKLY_COLUMNS, WEEKLY_STAT_TYPES, compact_weekly_data
+
+TEAMS = ['ARI', 'ATL', 'BAL', 'BUF', 'CAR', 'CHI']
+POSITIONS = ['QB', 'RB', 'WR', 'TE', 'K']
+SEASONS = (2020, 2021)
+
+
+def make_schedule(seasons=SEASONS) -> pd.DataFrame:
+    """
+    Builds a small schedule: every team has one bye week per regular season and two teams
+    play a postseason game.
+    """
+    rng = np.random.default_rng(7)
+    games = []
+    for season in seasons:
+        weeks = 18 if season >= 2021 else 17
+        for week in range(1, weeks + 1):
+            teams = [team for i, team in enumerate(TEAMS) if i + 4 + season % 2 != week]
+            rng.shuffle(teams)
+            for home, away in zip(teams[0::2], teams[1::2]):
+                games.append((season, week, 'REG', home, away))
+        games.append((season, weeks + 1, 'WC', TEAMS[0], TEAMS[1]))
+    schedule = pd.DataFrame(games, columns=['season', 'week', 'game_type', 'home_team', 'away_team'])
+    schedule['home_score'] = rng.integers(0, 40, len(schedule))
+    schedule['away_score'] = rng.integers(0, 40, len(schedule))
+    return schedule
+
+
+def make_weekly(schedule: pd.DataFrame, players: int = 24) -> pd.DataFrame:
+    """
+    Builds raw weekly player stats for the schedule, shaped like nfl_data_py.import_weekly_data:
+    players miss games, stats are often all zero, some values are missing, one player changes
+    teams mid-season and one game is listed twice.
+    """
+    rng = np.random.default_rng(11)
+    rows = []
+    for player in range(players):
+        for game in schedule.itertuples():
+            team = TEAMS[player % len(TEAMS)]
+            if player == 0 and game.week > 8:
+                team = TEAMS[1]
+            if team not in (game.home_team, game.away_team) or rng.random() < 0.25:
+                continue
+            row = {
+                'player_id': f'00-{player:07d}',
+                'player_name': f'P.Player{player}',
+                'position': POSITIONS[player % len(POSITIONS)],
+                'recent_team': team,
+                'season': game.season,
+                'week': game.week,
+                'season_type': 'REG' if game.game_type == 'REG' else 'POST',
+                'opponent_team': game.away_team if game.home_team == team else game.home_team,
+            }
+            zero = rng.random() < 0.4
+            for stat, cast in WEEKLY_STAT_TYPES.items():
+                if zero or rng.random() < 0.5:
+                    row[stat] = 0 if cast is int else 0.0
+                else:
+                    row[stat] = int(rng.integers(0, 12)) if cast is int else float(np.round(rng.normal(20, 30), 2))
+            if rng.random() < 0.05:
+                row['passing_epa'] = np.nan
+            if rng.random() < 0.05:
+                row['sacks'] = np.nan
+            rows.append(row)
+    weekly = pd.DataFrame(rows)
+    weekly = pd.concat([weekly, weekly.iloc[[5]].assign(carries=3)], ignore_index=True)
+    # nfl_data_py downcasts floats to float32.
+    floats = weekly.select_dtypes('float64').columns
+    weekly[floats] = weekly[floats].astype('float32')
+    return weekly.astype({'season': 'int32', 'week': 'int32'})
+
+
+@pytest.fixture(scope='session')
+def schedule_df() -> pd.DataFrame:
+    return make_schedule()
+
+
+@pytest.fixture(scope='session')
+def weekly_df(schedule_df) -> pd.DataFrame:
+    """Raw weekly player stats, as downloaded."""
+    return make_weekly(schedule_df)
+
+
+@pytest.fixture(scope='session')
+def compact_df(weekly_df) -> pd.DataFrame:
+    """The weekly stats as DataContext.weekly_data serves them to the pipelines."""
+    return compact_weekly_data(weekly_df[WEEKLY_COLUMNS])
@@ -0,0 +1,71 @@
+"""
+Checks the cache rules of data_source.
+"""
+import os
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from data_source import WEEKLY_DATA, cache_path, is_fresh, load_seasons, write_cache
+from ingestion_state import current_nfl_season, season_end
+
+
+def cached_at(tmp_path, when: datetime) -> str:
+    """A cache file last written at the given time."""
+    path = tmp_path / "cached.parquet"
+    path.write_bytes(b"")
+    os.utime(path, (when.timestamp(), when.timestamp()))
+    return str(path)
+
+
+def test_past_season_cached_after_it_ended_never_expires(tmp_path):
+    season = current_nfl_season() - 2
+    assert is_fresh(cached_at(tmp_path, season_end(season)), season)
+
+
+def test_past_season_cached_mid_season_expires(tmp_path):
+    season = current_nfl_season() - 2
+    assert not is_fresh(cached_at(tmp_path, datetime(season, 11, 15)), season)
+
+
+@pytest.fixture
+def expired_last_season(tmp_path, monkeypatch) -> int:
+    """Caches last season's weekly data in a file that has expired, and returns that season."""
+    monkeypatch.setenv("AGGREGATOR_CACHE_DIR", str(tmp_path))
+    season = current_nfl_season() - 1
+    path = cache_path(WEEKLY_DATA, season)
+    write_cache(pd.DataFrame({'season': [season], 'carries': [3]}), path)
+    written = datetime(season, 11, 15).timestamp()
+    os.utime(path, (written, written))
+    return season
+
+
+def unpublished_current_season(retry_error: Exception):
+    """A download that has no current season yet and fails with retry_error for the others."""
+    def fetch(seasons):
+        if current_nfl_season() in seasons:
+            raise FileNotFoundError("404")
+        raise retry_error
+    return fetch
+
+
+def test_unpublished_current_season_serves_expired_cache_when_retry_fails(expired_last_season):
+    years = [expired_last_season, current_nfl_season()]
+
+    loaded = load_seasons(WEEKLY_DATA, years, unpublished_current_season(ConnectionError("down")))
+
+    assert loaded.to_dict('list') == {'season': [expired_last_season], 'carries': [3]}
+
+
+def test_unpublished_current_season_loads_as_empty_with_cached_seasons_columns(expired_last_season):
+    os.utime(cache_path(WEEKLY_DATA, expired_last_season))
+    years = [expired_last_season, current_nfl_season()]
+    fetch = unpublished_current_season(AssertionError("only the current season is downloaded"))
+
+    loaded = load_seasons(WEEKLY_DATA, years, fetch)
+    empty = load_seasons(WEEKLY_DATA, years[1:], fetch)
+
+    assert loaded.to_dict('list') == {'season': [expired_last_season], 'carries': [3]}
+    assert loaded['carries'].dtype == 'int64'
+    assert list(empty.columns) == ['season'] and empty.empty
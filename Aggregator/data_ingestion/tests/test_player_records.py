@@ -0,0 +1,93 @@
+"""
+Checks the column-wise player game log transform against the row-by-row implementation it
+replaced: create_record applied with iterrows, and the former per-player week fill. Also checks
+the player info records against the values the row-by-row roster ingest stored.
+"""
+import json
+
+import pandas as pd
+
+from player_data.ingestion import (create_player_info_records, create_record, create_records, extract_bye_weeks,
+                                   transform_game_log_shard)
+from schema import WEEKLY_STAT_COLUMNS
+
+
+def reference_fill(player_df: pd.DataFrame, bye_weeks: dict) -> pd.DataFrame:
+    """The former fill_missing_weeks_for_player: one void row DataFrame per missing week."""
+    all_rows = []
+    for (season, season_type, team), subdf in player_df.groupby(['season', 'season_type', 'recent_team']):
+        present_weeks = subdf['week'].unique()
+        all_rows.append(subdf)
+        missing = sorted(set(range(present_weeks.min(), present_weeks.max() + 1)) - set(present_weeks))
+        for week in missing:
+            void_row = {
+                'player_id': subdf['player_id'].iloc[0],
+                'season': season,
+                'season_type': season_type,
+                'week': week,
+                'opponent_team': 'BYE' if week in bye_weeks.get((team, season), []) else None,
+                'recent_team': team,
+                **{column: 0 for column in WEEKLY_STAT_COLUMNS},
+            }
+            all_rows.append(pd.DataFrame([void_row]))
+    return pd.concat(all_rows, ignore_index=True) if all_rows else player_df
+
+
+def reference_transform(weekly_df: pd.DataFrame, bye_weeks: dict) -> list:
+    """The former per-player loop of ingest_player_game_logs."""
+    transformed = []
+    for player_id, group in weekly_df.groupby('player_id'):
+        group = reference_fill(group, bye_weeks)
+        group = group.drop_duplicates(subset=['season', 'week', 'season_type'], keep='last')
+        transformed.append((player_id, [create_record(player_id, row) for _, row in group.iterrows()]))
+    return transformed
+
+
+def json_lines(records: list) -> list:
+    """Serializes each record, so records only compare equal when their JSON is identical."""
+    return [json.dumps(record) for record in records]
+
+
+def test_create_records_matches_row_by_row_records(weekly_df, compact_df):
+    expected = [create_record(row['player_id'], row) for _, row in weekly_df.iterrows()]
+
+    records = create_records(compact_df)
+
+    assert json_lines(records) == json_lines(expected)
+
+
+def test_create_records_cleans_missing_and_blank_values():
+    df = pd.DataFrame({
+        'player_id': ['a', 'b'], 'season': [2021, 2021], 'week': [1, 1], 'season_type': ['REG', 'REG'],
+        'opponent_team': ['KC', 'KC'], 'recent_team': ['BUF', 'BUF'],
+        'completions': [float('nan'), 3.0], 'passing_yards': [0.0, float('nan')], 'carries': ['x', 0],
+    })
+
+    records = create_records(df)
+
+    assert json_lines(records) == json_lines([create_record(row['player_id'], row) for _, row in df.iterrows()])
+    assert records[0]['passing_stats'] is None
+
+
+def test_transform_matches_per_player_fill(weekly_df, compact_df, schedule_df):
+    bye_weeks = extract_bye_weeks(schedule_df)
+    expected = reference_transform(weekly_df, bye_weeks)
+
+    transformed = transform_game_log_shard(compact_df, bye_weeks)
+
+    assert any(record['opponent_team'] == 'BYE' for _, records in transformed for record in records)
+    assert [player_id for player_id, _ in transformed] == [player_id for player_id, _ in expected]
+    for (_, records), (_, expected_records) in zip(transformed, expected):
+        assert json_lines(records) == json_lines(expected_records)
+
+
+def test_player_info_records_keep_the_stored_birth_date_values():
+    roster_df = pd.DataFrame({
+        'player_id': ['a', 'b', 'c', 'd'], 'player_name': ['A', 'B', 'C', 'D'],
+        'birth_date': ['1990-01-31', float('nan'), None, '1995-07-04 00:00:00'],
+    })
+
+    records = create_player_info_records(roster_df)
+
+    # The former row-by-row value: str(clean_date_field(...)) unless the birth date is None.
+    assert [record['info']['birth_date'] for record in records] == ['1990-01-31', 'None', None, '1995-07-04']
@@ -0,0 +1,53 @@
+"""
+Checks that ingesting one chunk of seasons at a time produces the same records as ingesting
+every season at once.
+"""
+import json
+
+import pytest
+
+from data_context import select_seasons
+from pipeline import season_chunks
+from player_data.ingestion import (accumulate_player_stats, aggregate_player_season_stats, extract_bye_weeks,
+                                   transform_game_log_shard)
+from team_data.ingestion import (accumulate_team_stats, aggregate_team_season_stats, build_team_game_log_records,
+                                 create_matchup_records, create_team_stat_records, prepare_team_game_logs)
+
+
+def by_key(pairs: list) -> dict:
+    """Joins (key, records) pairs from several chunks into key -> records, in chunk order."""
+    joined = {}
+    for key, records in pairs:
+        joined.setdefault(key, []).extend(records)
+    return {key: [json.dumps(record) for record in records] for key, records in joined.items()}
+
+
+def unordered(records: list) -> list:
+    """Records of tables without a meaningful row order, serialized and sorted."""
+    return sorted(json.dumps(record, sort_keys=True) for record in records)
+
+
+def transform_players(weekly_df, schedule_df) -> tuple:
+    """The player ingest transform of one chunk."""
+    return (transform_game_log_shard(weekly_df, extract_bye_weeks(schedule_df)),
+            aggregate_player_season_stats(weekly_df), accumulate_player_stats(weekly_df))
+
+
+def transform_teams(weekly_df, schedule_df) -> tuple:
+    """The team ingest transform of one chunk."""
+    prepared = prepare_team_game_logs(weekly_df, schedule_df)
+    stat_records = create_team_stat_records(prepared)
+    return (build_team_game_log_records(prepared), stat_records, aggregate_team_season_stats(stat_records),
+            accumulate_team_stats(stat_records), create_matchup_records(weekly_df))
+
+
+@pytest.mark.parametrize('transform', [transform_players, transform_teams])
+def test_season_chunks_match_single_shot(transform, compact_df, schedule_df):
+    single = transform(compact_df, schedule_df)
+    chunks = [transform(select_seasons(compact_df, seasons), select_seasons(schedule_df, seasons))
+              for seasons in season_chunks(sorted(schedule_df['season'].unique()), 1)]
+
+    game_logs, *tables = zip(*chunks)
+    assert by_key([pair for chunk in game_logs for pair in chunk]) == by_key(single[0])
+    for table, single_table in zip(tables, single[1:]):
+        assert unordered([record for chunk in table for record in chunk]) == unordered(single_table)
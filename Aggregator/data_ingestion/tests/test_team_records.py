@@ -0,0 +1,65 @@
+"""
+Checks the team game log transform against the row-by-row implementation it replaced:
+lookup_scores and compute_game_result applied team by team with iterrows. The full records are
+checked against records frozen in tests/data, one JSON record per line. They match what the
+original aggregate_team_game_logs wrote for the same fixture, except in the last digits of the
+float defensive totals, which are now summed in float64.
+"""
+import json
+import os
+
+import pandas as pd
+
+from team_data.ingestion import (attach_scores, build_schedule_index, build_team_game_log_records, compute_game_result,
+                                 create_team_stat_records, lookup_scores, prepare_team_game_logs)
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+
+def expected_lines(name: str) -> list:
+    """The frozen records of a table, serialized one per line."""
+    with open(os.path.join(DATA_DIR, name)) as f:
+        return f.read().splitlines()
+
+
+def reference_game_results(prepared, schedule_index: dict) -> list:
+    """The former per-team loop that computed each game result and running record."""
+    results = []
+    for team_abbr, group in prepared.groupby('team_abbr', sort=False, observed=True):
+        current_season, wins, losses, ties = None, 0, 0, 0
+        for _, row in group.iterrows():
+            game_result, current_season, wins, losses, ties = compute_game_result(
+                row, team_abbr, schedule_index, current_season, wins, losses, ties)
+            results.append(game_result)
+    return results
+
+
+def test_attach_scores_matches_lookup_scores(compact_df, schedule_df):
+    prepared = prepare_team_game_logs(compact_df, schedule_df)
+    schedule_index = build_schedule_index(schedule_df)
+    expected = [lookup_scores(row, row['team_abbr'], schedule_index) for _, row in prepared.iterrows()]
+
+    scored = attach_scores(prepared, schedule_index)
+
+    assert scored['team_score'].notna().any()
+    scores = zip(scored['team_score'].tolist(), scored['opponent_score'].tolist())
+    assert [(None, None) if pd.isna(team_score) else (team_score, opponent_score)
+            for team_score, opponent_score in scores] == expected
+
+
+def test_game_results_match_per_row_results(compact_df, schedule_df):
+    prepared = prepare_team_game_logs(compact_df, schedule_df)
+    expected = reference_game_results(prepared, build_schedule_index(schedule_df))
+
+    assert 'BYE' in expected
+    assert [json.dumps(result) for result in prepared['game_result']] == [json.dumps(result) for result in expected]
+
+
+def test_team_records_match_frozen_records(compact_df, schedule_df):
+    prepared = prepare_team_game_logs(compact_df, schedule_df)
+
+    game_logs = [json.dumps(record) for _, records in build_team_game_log_records(prepared) for record in records]
+    stats = [json.dumps(record) for record in create_team_stat_records(prepared)]
+
+    assert game_logs == expected_lines('team_game_logs.jsonl')
+    assert stats == expected_lines('team_game_stats.jsonl')
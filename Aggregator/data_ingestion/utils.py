@@ -1,4 +1,5 @@
 import math
+import numpy as np
 import pandas as pd
 from typing import Optional, Any
 
@@ -62,4 +63,78 @@ def clean_optional_str(value: Any) -> Optional[str]:
     """
     if pd.isna(value) or (isinstance(value, float) and math.isnan(value)):
         return None
-    return str(value)
\ No newline at end of file
+    return str(value)
+
+def _to_numeric_column(values: pd.Series) -> pd.Series:
+    """
+    Parses a column as float64, with NaN wherever a value is missing, unparseable or infinite.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.astype(object)
+    numeric = pd.to_numeric(values, errors='coerce').astype('float64')
+    return numeric.mask(np.isinf(numeric))
+
+def clean_date_column(values: pd.Series) -> pd.Series:
+    """
+    Column version of clean_date_field: converts every value to a 'YYYY-MM-DD' string with a
+    single to_datetime call. Missing and unparseable dates become <NA>.
+
+    Args:
+        values (pd.Series): The input date values.
+
+    Returns:
+        pd.Series: A nullable string column.
+    """
+    dates = pd.to_datetime(values, errors='coerce')
+    return dates.dt.strftime('%Y-%m-%d').astype('string')
+
+def clean_optional_int_column(values: pd.Series) -> pd.Series:
+    """
+    Column version of clean_optional_int: parses every value with to_numeric and truncates it to an integer.
+    Missing and unparseable values become <NA>.
+
+    Args:
+        values (pd.Series): The input values.
+
+    Returns:
+        pd.Series: A nullable Int64 column.
+    """
+    return np.trunc(_to_numeric_column(values)).astype('Int64')
+
+def clean_optional_float_column(values: pd.Series) -> pd.Series:
+    """
+    Column version of clean_optional_float. Missing and unparseable values become <NA>.
+
+    Args:
+        values (pd.Series): The input values.
+
+    Returns:
+        pd.Series: A nullable Float64 column.
+    """
+    return _to_numeric_column(values).astype('Float64')
+
+def clean_optional_str_column(values: pd.Series) -> pd.Series:
+    """
+    Column version of clean_optional_str. Missing values become <NA>.
+
+    Args:
+        values (pd.Series): The input values.
+
+    Returns:
+        pd.Series: A nullable string column.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.astype(object)
+    return values.astype('string')
+
+def column_values(values: pd.Series) -> list:
+    """
+    Converts a cleaned column to Python values for records, with None for missing values.
+
+    Args:
+        values (pd.Series): A column returned by one of the clean_*_column functions.
+
+    Returns:
+        list: Python ints, floats or strings, and None.
+    """
+    return values.to_numpy(dtype=object, na_value=None).tolist()